@@ -6,22 +6,30 @@ It initializes the Flask app, database, JWT, CORS, and registers all routes.
 """
 
 import os
+from importlib import import_module
 from flask import Flask, jsonify
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from config import get_config
 from models import db, migrate, init_db
+from utils.cache import init_cache
 from utils.error_handlers import register_error_handlers
+from utils.serialization import ORJSONProvider
 
-# Import routes
-from routes.auth import auth_bp
-from routes.profile import profile_bp
-from routes.onboarding import onboarding_bp
-from routes.companies import companies_bp
-from routes.contacts import contacts_bp
-from routes.applications import applications_bp
-from routes.goals import goals_bp
-from routes.notifications import notifications_bp
+__all__ = ['create_app']
+
+# Route modules under routes/, each exposing a `<name>_bp` blueprint.
+# They are imported inside create_app() so only building an app pays for them.
+BLUEPRINT_MODULES = (
+    'auth',
+    'profile',
+    'onboarding',
+    'companies',
+    'contacts',
+    'applications',
+    'goals',
+    'notifications'
+)
 
 
 def create_app():
@@ -38,9 +46,15 @@ def create_app():
     config = get_config()
     app.config.from_object(config)
     
+    # Serialize JSON with orjson
+    app.json = ORJSONProvider(app)
+    
     # Initialize database
     init_db(app)
     
+    # Redis list-response cache (off when REDIS_URL is not set)
+    init_cache(app)
+    
     # Initialize JWT
     jwt = JWTManager(app)
     
@@ -51,18 +65,14 @@ def create_app():
     register_error_handlers(app)
     
     # Register blueprints
-    app.register_blueprint(auth_bp)
-    app.register_blueprint(profile_bp)
-    app.register_blueprint(onboarding_bp)
-    app.register_blueprint(companies_bp)
-    app.register_blueprint(contacts_bp)
-    app.register_blueprint(applications_bp)
-    app.register_blueprint(goals_bp)
-    app.register_blueprint(notifications_bp)
+    for name in BLUEPRINT_MODULES:
+        module = import_module(f'routes.{name}')
+        app.register_blueprint(getattr(module, f'{name}_bp'))
     
-    # Create tables if they don't exist
-    with app.app_context():
-        db.create_all()
+    # Create tables if they don't exist (migrations manage the schema otherwise)
+    if app.config.get('AUTO_CREATE_TABLES'):
+        with app.app_context():
+            db.create_all()
     
     # Health check endpoint
     @app.route('/api/v1/health', methods=['GET'])
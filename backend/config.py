@@ -1,9 +1,12 @@
 import os
 from datetime import timedelta
+from functools import lru_cache
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+# Load environment variables from .env file (once, even if forked workers re-import this module)
+if not os.getenv('DOTENV_LOADED'):
+    load_dotenv()
+    os.environ['DOTENV_LOADED'] = '1'
 
 class Config:
     """Base configuration class with common settings"""
@@ -19,7 +22,28 @@ class Config:
     
     SQLALCHEMY_DATABASE_URI = DATABASE_URL
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    SQLALCHEMY_ECHO = FLASK_ENV == 'development' # Log SQL queries in dev
+    SQLALCHEMY_ECHO = os.getenv('SQLALCHEMY_ECHO', '0') == '1' # Log SQL queries only when explicitly requested
+
+    # Connection pool settings (SQLite manages its own pool, so only apply to server databases)
+    SQLALCHEMY_ENGINE_OPTIONS = {} if DATABASE_URL.startswith('sqlite') else {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', 20)),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 10)),
+        # Drop stale connections before handing them out. Costs a round trip per checkout;
+        # set DB_POOL_PRE_PING=0 where the database never drops idle connections
+        'pool_pre_ping': os.getenv('DB_POOL_PRE_PING', '1') == '1',
+        'pool_recycle': 1800,  # Recycle before the server closes idle connections
+        'pool_timeout': 10,
+        # Reuse the most recently returned connection, so a few hot connections serve
+        # most requests and surplus ones sit idle until recycled
+        'pool_use_lifo': True
+    }
+
+    # Schema is managed by Flask-Migrate ('flask db upgrade'); only create tables on startup when asked (e.g. tests)
+    AUTO_CREATE_TABLES = os.getenv('AUTO_CREATE_TABLES', '0') == '1'
+
+    # Redis list-response cache (disabled when REDIS_URL is not set)
+    REDIS_URL = os.getenv('REDIS_URL')
+    LIST_CACHE_TTL = int(os.getenv('LIST_CACHE_TTL', 60))  # Seconds
 
     # JWT settings
     JWT_SECRET_KEY = os.getenv('JWT_SECRET', 'jwt-secret-key-change-in-production')
@@ -62,7 +86,8 @@ config = {
     'default': DevelopmentConfig
 }
 
+@lru_cache(maxsize=None)
 def get_config():
-    """Get configuration based on FLASK_ENV"""
+    """Get configuration based on FLASK_ENV (resolved once per process)"""
     env = os.getenv('FLASK_ENV', 'development')
     return config.get(env, config['default'])
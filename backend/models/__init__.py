@@ -1,13 +1,200 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
+from alembic.operations import ops as alembic_ops
+from alembic.autogenerate import renderers as alembic_renderers
+from alembic.autogenerate.render import render_op, _alter_column as _render_alter_column_default
+from sqlalchemy import select, func, event, DDL
+from sqlalchemy.orm import column_property
+from sqlalchemy.sql.expression import FunctionElement
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.dialects.postgresql import JSONB, insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 db = SQLAlchemy()
 migrate = Migrate()
 
+# JSON column type: native JSONB on PostgreSQL, generic JSON elsewhere (e.g. SQLite in dev)
+JSONType = db.JSON().with_variant(JSONB(), 'postgresql')
+
+# Primary/foreign key type: 64-bit on server databases, plain INTEGER on SQLite
+# (only INTEGER PRIMARY KEY columns auto-increment there)
+IDType = db.BigInteger().with_variant(db.Integer(), 'sqlite')
+
+class utcnow(FunctionElement):
+    """
+    Current UTC time as a naive timestamp, for server defaults.
+    
+    The timestamp columns are naive UTC (the app writes datetime.utcnow()), so the
+    database default must be UTC too. PostgreSQL's now() cast to a timestamp without
+    time zone would give the session's local time instead.
+    """
+    type = db.DateTime()
+    inherit_cache = True
+
+@compiles(utcnow, 'postgresql')
+def _pg_utcnow(element, compiler, **kw):
+    return "timezone('utc', now())"
+
+@compiles(utcnow)
+def _default_utcnow(element, compiler, **kw):
+    # SQLite's CURRENT_TIMESTAMP is already UTC
+    return 'CURRENT_TIMESTAMP'
+
+# Trigram indexes (gin_trgm_ops) need the pg_trgm extension on PostgreSQL.
+# db.create_all() (AUTO_CREATE_TABLES) creates it through this listener; migrations
+# get it from _process_revision_directives below.
+CREATE_PG_TRGM = 'CREATE EXTENSION IF NOT EXISTS pg_trgm'
+event.listen(
+    db.metadata,
+    'before_create',
+    DDL(CREATE_PG_TRGM).execute_if(dialect='postgresql')
+)
+
+class PostgresOnlyOps(alembic_ops.MigrateOperation):
+    """Migration ops that only run when the migration is applied to PostgreSQL."""
+
+    def __init__(self, ops):
+        self.ops = ops
+
+@alembic_renderers.dispatch_for(PostgresOnlyOps)
+def _render_postgres_only(autogen_context, op):
+    lines = ["if op.get_bind().dialect.name == 'postgresql':"]
+    for inner in op.ops:
+        lines.extend(render_op(autogen_context, inner))
+    lines.append('')
+    return lines
+
+def _uses_trigram_index(ops):
+    """Check whether autogenerated migration ops create a gin_trgm_ops index."""
+    for op in ops:
+        if isinstance(op, alembic_ops.CreateIndexOp):
+            if 'gin_trgm_ops' in (op.kw.get('postgresql_ops') or {}).values():
+                return True
+        elif _uses_trigram_index(getattr(op, 'ops', ())):
+            return True
+    return False
+
+@alembic_renderers.dispatch_for(alembic_ops.AlterColumnOp, replace=True)
+def _render_alter_column(autogen_context, op):
+    # Alembic's renderer drops dialect options; keep postgresql_using for the JSONB casts
+    text = _render_alter_column_default(autogen_context, op)
+    if 'postgresql_using' in op.kw:
+        text = f"{text[:-1]},\n{' ' * 11}postgresql_using={op.kw['postgresql_using']!r})"
+    return text
+
+def _cast_text_columns_to_jsonb(ops):
+    """
+    Add a USING cast to autogenerated Text -> JSONType column changes.
+    
+    The JSON columns used to be Text holding json.dumps() output. PostgreSQL can't
+    change TEXT to JSONB without an explicit cast (empty strings become NULL).
+    """
+    for op in ops:
+        if isinstance(op, alembic_ops.AlterColumnOp):
+            if (isinstance(op.modify_type, db.JSON) and isinstance(op.existing_type, db.String)
+                    and not isinstance(op.existing_type, db.JSON)):
+                op.kw['postgresql_using'] = f"NULLIF({op.column_name}, '')::jsonb"
+        else:
+            _cast_text_columns_to_jsonb(getattr(op, 'ops', ()))
+
+def _process_revision_directives(context, revision, directives):
+    """
+    Adjust autogenerated migrations ('flask db migrate').
+    
+    Skips writing a migration when no schema changes were detected (what the
+    Flask-Migrate env.py does by default), casts former Text columns to JSONB with
+    USING on PostgreSQL, and starts any migration that creates a trigram index
+    with CREATE EXTENSION IF NOT EXISTS pg_trgm. Migrations are often generated
+    against SQLite and applied to PostgreSQL, so the extension is added whatever
+    the database here, and checked for when the migration runs.
+    """
+    if not getattr(context.config.cmd_opts, 'autogenerate', False):
+        return
+    
+    script = directives[0]
+    if script.upgrade_ops.is_empty():
+        directives[:] = []
+        return
+    
+    _cast_text_columns_to_jsonb(script.upgrade_ops.ops)
+    if _uses_trigram_index(script.upgrade_ops.ops):
+        script.upgrade_ops.ops.insert(0, PostgresOnlyOps([alembic_ops.ExecuteSQLOp(CREATE_PG_TRGM)]))
+
+def _render_item(type_, obj, autogen_context):
+    """
+    Render JSONType and utcnow() defaults in autogenerated migrations.
+    
+    Alembic writes the JSONB variant as JSONB(astext_type=Text()) without importing
+    Text, which fails when the migration runs. utcnow() would be compiled for the
+    database the migration is generated on (CURRENT_TIMESTAMP on SQLite, local time
+    on PostgreSQL), so the construct itself is imported into the migration instead.
+    """
+    if type_ == 'server_default' and isinstance(getattr(obj, 'arg', None), utcnow):
+        autogen_context.imports.add('from models import utcnow')
+        return 'utcnow()'
+    if type_ == 'type' and isinstance(obj, db.JSON) and 'postgresql' in getattr(obj, '_variant_mapping', {}):
+        autogen_context.imports.add('from sqlalchemy.dialects import postgresql')
+        return "sa.JSON().with_variant(postgresql.JSONB(), 'postgresql')"
+    return False
+
+# Dialect-specific INSERT constructs supporting ON CONFLICT
+_UPSERT_INSERTS = {
+    'postgresql': postgresql_insert,
+    'sqlite': sqlite_insert,
+}
+
+def insert_ignore(model, conflict_columns, **values):
+    """
+    Insert a row unless one with the same unique key exists, in one statement.
+    
+    Uses INSERT ... ON CONFLICT DO NOTHING RETURNING, so concurrent requests
+    can't create duplicates or fail on the unique constraint.
+    
+    Args:
+        model: Model class to insert into
+        conflict_columns (list): Column names of the unique constraint
+        **values: Column values for the new row
+        
+    Returns:
+        The new model instance, or None if the row already existed
+    """
+    stmt = _insert_on_conflict_do_nothing(model, conflict_columns).values(**values).returning(model)
+    return db.session.scalars(stmt).one_or_none()
+
+def insert_ignore_many(model, conflict_columns, rows):
+    """
+    Bulk insert rows, skipping any that would duplicate an existing unique key.
+    
+    Args:
+        model: Model class to insert into
+        conflict_columns (list): Column names of the unique constraint
+        rows (list): Dicts of column values, one per row
+        
+    Returns:
+        int: Number of rows inserted
+    """
+    if not rows:
+        return 0
+    stmt = (
+        _insert_on_conflict_do_nothing(model, conflict_columns)
+        .returning(model.id)
+        .execution_options(render_nulls=True)
+    )
+    return len(db.session.execute(stmt, rows).all())
+
+def _insert_on_conflict_do_nothing(model, conflict_columns):
+    """Build an INSERT ... ON CONFLICT DO NOTHING for the session's database."""
+    insert = _UPSERT_INSERTS[db.session.get_bind().dialect.name]
+    return insert(model).on_conflict_do_nothing(index_elements=conflict_columns)
+
 def init_db(app):
     """Initialize the database and migration engine."""
     db.init_app(app)
-    migrate.init_app(app, db)
+    migrate.init_app(
+        app, db,
+        process_revision_directives=_process_revision_directives,
+        render_item=_render_item
+    )
 
 # Import all models here so they are registered with SQLAlchemy
 from .user import User
@@ -20,3 +207,22 @@ from .cv_analysis import CVAnalysis
 from .goal import Goal
 from .streak import Streak
 from .notification import Notification
+
+# Related record counts for companies, computed as correlated subqueries in the
+# company SELECT. Deferred so they are only fetched with undefer_group('related_counts').
+Company.contacts_count = column_property(
+    select(func.count(Contact.id))
+    .where(Contact.company_id == Company.id)
+    .correlate_except(Contact)
+    .scalar_subquery(),
+    deferred=True,
+    group='related_counts'
+)
+Company.applications_count = column_property(
+    select(func.count(Application.id))
+    .where(Application.company_id == Company.id)
+    .correlate_except(Application)
+    .scalar_subquery(),
+    deferred=True,
+    group='related_counts'
+)
@@ -1,7 +1,8 @@
 from datetime import datetime
-from flask_sqlalchemy import SQLAlchemy
+from . import db, IDType, utcnow
 
-db = SQLAlchemy()
+# Kanban board columns an application can be in
+VALID_STATUSES = frozenset(('Planned', 'Applied', 'Interview', 'Offer', 'Rejected'))
 
 class Application(db.Model):
     """
@@ -14,32 +15,48 @@ class Application(db.Model):
     __tablename__ = 'applications'
 
     # Primary fields
-    id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
-    company_id = db.Column(db.Integer, db.ForeignKey('companies.id'), nullable=False, index=True)
+    id = db.Column(IDType, db.Identity(always=False), primary_key=True)
+    user_id = db.Column(IDType, db.ForeignKey('users.id'), nullable=False)
+    company_id = db.Column(IDType, db.ForeignKey('companies.id'), nullable=False, index=True)
 
     # Application information
     job_title = db.Column(db.String(255), nullable=False)  # Job title (min 3 chars)
     job_url = db.Column(db.String(255))  # Link to job posting
-    status = db.Column(db.String(50), nullable=False, default='Planned', index=True)
+    status = db.Column(db.String(50), nullable=False, default='Planned', server_default='Planned')
     # Status options: Planned, Applied, Interview, Offer, Rejected
     applied_date = db.Column(db.Date)  # Date when application was submitted
     notes = db.Column(db.Text)  # User's notes about the application
 
     # Timestamps
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at = db.Column(db.DateTime, server_default=utcnow(), nullable=False)
+    updated_at = db.Column(db.DateTime, server_default=utcnow(), onupdate=datetime.utcnow, nullable=False)
 
     # Relationships
-    outreach_activities = db.relationship('OutreachActivity', backref='application', lazy='dynamic')
-    cv_analyses = db.relationship('CVAnalysis', backref='application', lazy='dynamic')
+    outreach_activities = db.relationship('OutreachActivity', backref='application')
+    cv_analyses = db.relationship('CVAnalysis', backref='application')
+
+    # Composite indexes matching the application list queries
+    __table_args__ = (
+        db.CheckConstraint(
+            status.in_(sorted(VALID_STATUSES)),
+            name='ck_app_status_valid'
+        ),
+        # Application list: filter by user (and status), newest first
+        db.Index('ix_app_user_status_created', 'user_id', 'status', created_at.desc()),
+        db.Index('ix_app_user_company', 'user_id', 'company_id'),
+        # Trigram index so job title ILIKE '%term%' searches can use an index (PostgreSQL only)
+        db.Index('ix_app_job_title_trgm', 'job_title',
+                 postgresql_using='gin', postgresql_ops={'job_title': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
+    )
 
     def to_dict(self, include_company=False):
         """
         Convert application to dictionary for API responses.
         
         Args:
-            include_company (bool): Whether to include company details
+            include_company (bool): Whether to include company details. When
+                serializing many applications, eager-load Application.company
+                at the query (e.g. selectinload) to avoid one query per row.
             
         Returns:
             dict: Application data as dictionary
@@ -51,10 +68,10 @@ class Application(db.Model):
             'job_title': self.job_title,
             'job_url': self.job_url,
             'status': self.status,
-            'applied_date': self.applied_date.isoformat() if self.applied_date else None,
+            'applied_date': self.applied_date,
             'notes': self.notes,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
 
         if include_company and self.company:
@@ -63,4 +80,4 @@ class Application(db.Model):
         return app_dict
 
     def __repr__(self):
-        return f'<Application {self.job_title} at {self.company.name if self.company else "Unknown"}>'
+        return f'<Application {self.job_title} company_id={self.company_id}>'
@@ -1,7 +1,4 @@
-from datetime import datetime
-from flask_sqlalchemy import SQLAlchemy
-
-db = SQLAlchemy()
+from . import db, IDType, utcnow
 
 class Company(db.Model):
     """
@@ -13,8 +10,8 @@ class Company(db.Model):
     __tablename__ = 'companies'
 
     # Primary fields
-    id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    id = db.Column(IDType, db.Identity(always=False), primary_key=True)
+    user_id = db.Column(IDType, db.ForeignKey('users.id'), nullable=False, index=True)
 
     # Company information
     name = db.Column(db.String(255), nullable=False)
@@ -24,19 +21,27 @@ class Company(db.Model):
     notes = db.Column(db.Text)
 
     # Timestamps
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    created_at = db.Column(db.DateTime, server_default=utcnow(), nullable=False)
 
     # Relationships
-    contacts = db.relationship('Contact', backref='company', lazy='dynamic', cascade='all, delete-orphan')
-    applications = db.relationship('Application', backref='company', lazy='dynamic', cascade='all, delete-orphan')
-    outreach_activities = db.relationship('OutreachActivity', backref='company', lazy='dynamic')
+    contacts = db.relationship('Contact', backref='company', cascade='all, delete-orphan')
+    applications = db.relationship('Application', backref='company', cascade='all, delete-orphan')
+    outreach_activities = db.relationship('OutreachActivity', backref='company')
+
+    # Trigram index so name ILIKE '%term%' searches can use an index (PostgreSQL only)
+    __table_args__ = (
+        db.Index('ix_company_name_trgm', 'name',
+                 postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
+    )
 
     def to_dict(self, include_related=False):
         """
         Convert company to dictionary for API responses.
         
         Args:
-            include_related (bool): Whether to include counts of related records
+            include_related (bool): Whether to include counts of related records.
+                The counts are deferred columns; load them with the query option
+                undefer_group('related_counts') to fetch them in the same SELECT.
             
         Returns:
             dict: Company data as dictionary
@@ -49,12 +54,12 @@ class Company(db.Model):
             'location': self.location,
             'industry': self.industry,
             'notes': self.notes,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at
         }
 
         if include_related:
-            company_dict['contacts_count'] = self.contacts.count()
-            company_dict['applications_count'] = self.applications.count()
+            company_dict['contacts_count'] = self.contacts_count
+            company_dict['applications_count'] = self.applications_count
 
         return company_dict
 
@@ -1,7 +1,4 @@
-from datetime import datetime
-from flask_sqlalchemy import SQLAlchemy
-
-db = SQLAlchemy()
+from . import db, IDType, utcnow
 
 class Contact(db.Model):
     """
@@ -13,9 +10,9 @@ class Contact(db.Model):
     __tablename__ = 'contacts'
 
     # Primary fields
-    id = db.Column(db.Integer, primary_key=True)
-    company_id = db.Column(db.Integer, db.ForeignKey('companies.id'), nullable=False, index=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    id = db.Column(IDType, db.Identity(always=False), primary_key=True)
+    company_id = db.Column(IDType, db.ForeignKey('companies.id'), nullable=False, index=True)
+    user_id = db.Column(IDType, db.ForeignKey('users.id'), nullable=False)
 
     # Contact information
     name = db.Column(db.String(255), nullable=False)
@@ -25,14 +22,21 @@ class Contact(db.Model):
     source = db.Column(db.String(50))  # 'API' (from Hunter.io) or 'Manual' (user added)
 
     # Timestamps
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    created_at = db.Column(db.DateTime, server_default=utcnow(), nullable=False)
 
     # Relationships
-    outreach_activities = db.relationship('OutreachActivity', backref='contact', lazy='dynamic')
+    outreach_activities = db.relationship('OutreachActivity', backref='contact')
 
     # Unique constraint: same email can't exist twice for same company
     __table_args__ = (
         db.UniqueConstraint('company_id', 'email', name='unique_company_email'),
+        # Contact list: user's contacts (optionally for one company) in id order
+        db.Index('ix_contact_user_company', 'user_id', 'company_id', 'id'),
+        # Trigram indexes so name/email ILIKE '%term%' searches can use an index (PostgreSQL only)
+        db.Index('ix_contact_name_trgm', 'name',
+                 postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
+        db.Index('ix_contact_email_trgm', 'email',
+                 postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
     )
 
     def to_dict(self):
@@ -51,7 +55,7 @@ class Contact(db.Model):
             'linkedin_url': self.linkedin_url,
             'role': self.role,
             'source': self.source,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at
         }
 
     def __repr__(self):
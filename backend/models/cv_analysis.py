@@ -1,7 +1,7 @@
-from datetime import datetime
-from flask_sqlalchemy import SQLAlchemy
+from . import db, JSONType, IDType, utcnow
 
-db = SQLAlchemy()
+# Shared immutable stand-in for unset JSON arrays (serialized as [])
+_EMPTY = ()
 
 class CVAnalysis(db.Model):
     """
@@ -13,9 +13,9 @@ class CVAnalysis(db.Model):
     __tablename__ = 'cv_analyses'
 
     # Primary fields
-    id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
-    application_id = db.Column(db.Integer, db.ForeignKey('applications.id'), nullable=True, index=True)
+    id = db.Column(IDType, db.Identity(always=False), primary_key=True)
+    user_id = db.Column(IDType, db.ForeignKey('users.id'), nullable=False, index=True)
+    application_id = db.Column(IDType, db.ForeignKey('applications.id'), nullable=True, index=True)
 
     # File and content information
     cv_filename = db.Column(db.String(255))  # Name of uploaded CV file
@@ -23,24 +23,23 @@ class CVAnalysis(db.Model):
 
     # Analysis results
     ats_score = db.Column(db.Integer)  # ATS score (0-100)
-    matched_keywords = db.Column(db.Text)  # JSON array of matched keywords
-    missing_keywords = db.Column(db.Text)  # JSON array of missing keywords
-    suggestions = db.Column(db.Text)  # JSON array of improvement suggestions
+    matched_keywords = db.Column(JSONType)  # JSON array of matched keywords
+    missing_keywords = db.Column(JSONType)  # JSON array of missing keywords
+    suggestions = db.Column(JSONType)  # JSON array of improvement suggestions
 
     # Metadata
     api_used = db.Column(db.String(50))  # Which API was used for analysis (or 'custom')
 
     # Timestamps
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    created_at = db.Column(db.DateTime, server_default=utcnow(), nullable=False)
 
     def to_dict(self):
         """
         Convert CV analysis to dictionary for API responses.
         
         Returns:
-            dict: CV analysis data as dictionary with parsed JSON arrays
+            dict: CV analysis data as dictionary
         """
-        import json
         return {
             'id': self.id,
             'user_id': self.user_id,
@@ -48,11 +47,11 @@ class CVAnalysis(db.Model):
             'cv_filename': self.cv_filename,
             'job_description': self.job_description,
             'ats_score': self.ats_score,
-            'matched_keywords': json.loads(self.matched_keywords) if self.matched_keywords else [],
-            'missing_keywords': json.loads(self.missing_keywords) if self.missing_keywords else [],
-            'suggestions': json.loads(self.suggestions) if self.suggestions else [],
+            'matched_keywords': self.matched_keywords or _EMPTY,
+            'missing_keywords': self.missing_keywords or _EMPTY,
+            'suggestions': self.suggestions or _EMPTY,
             'api_used': self.api_used,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at
         }
 
     def __repr__(self):
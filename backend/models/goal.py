@@ -1,7 +1,6 @@
-from datetime import datetime
-from flask_sqlalchemy import SQLAlchemy
-
-db = SQLAlchemy()
+from datetime import datetime, timedelta
+from sqlalchemy import update
+from . import db, IDType, insert_ignore, utcnow
 
 class Goal(db.Model):
     """
@@ -13,8 +12,8 @@ class Goal(db.Model):
     __tablename__ = 'goals'
 
     # Primary fields
-    id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    id = db.Column(IDType, db.Identity(always=False), primary_key=True)
+    user_id = db.Column(IDType, db.ForeignKey('users.id'), nullable=False, index=True)
 
     # Goal tracking
     week_start = db.Column(db.Date, nullable=False, index=True)  # Monday of the week
@@ -24,14 +23,74 @@ class Goal(db.Model):
     outreach_current = db.Column(db.Integer, default=0)  # Current count of outreach activities
 
     # Timestamps
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at = db.Column(db.DateTime, server_default=utcnow(), nullable=False)
+    updated_at = db.Column(db.DateTime, server_default=utcnow(), onupdate=datetime.utcnow, nullable=False)
 
     # Unique constraint: one goal per user per week
     __table_args__ = (
         db.UniqueConstraint('user_id', 'week_start', name='unique_user_week_goal'),
     )
 
+    @staticmethod
+    def current_week_start():
+        """
+        Get the Monday of the current week (UTC).
+        
+        Inside a request, prefer utils.request_time.request_week_start().
+        
+        Returns:
+            date: Start of the current goal week
+        """
+        today = datetime.utcnow().date()
+        return today - timedelta(days=today.weekday())
+
+    @classmethod
+    def get_or_create(cls, user_id, week_start):
+        """
+        Get the user's goal for a week, creating it if missing.
+        
+        Args:
+            user_id (int): ID of the user
+            week_start (date): Start of the goal week
+            
+        Returns:
+            tuple: (goal, created) where created is True if the goal was just inserted
+        """
+        goal = cls.query.filter_by(user_id=user_id, week_start=week_start).first()
+        if goal:
+            return goal, False
+
+        goal = insert_ignore(cls, ['user_id', 'week_start'], user_id=user_id, week_start=week_start)
+        if goal:
+            return goal, True
+
+        # Another request created it first
+        return cls.query.filter_by(user_id=user_id, week_start=week_start).one(), False
+
+    @classmethod
+    def increment_applications(cls, user_id, week_start=None):
+        """
+        Add one application to the user's goal for the current week.
+        
+        Runs a single UPDATE ... SET applications_current = applications_current + 1,
+        so concurrent requests can't lose increments. Does nothing if the user has
+        no goal for this week.
+        
+        Args:
+            user_id (int): ID of the user
+            week_start (date): Start of the goal week (default: current week)
+        """
+        db.session.execute(
+            update(cls)
+            .where(cls.user_id == user_id, cls.week_start == (week_start or cls.current_week_start()))
+            .values(applications_current=cls.applications_current + 1)
+        )
+
+    @staticmethod
+    def _progress(current, goal):
+        """Percentage of a goal reached, capped at 100 (0 when no goal is set)."""
+        return min(100, current * 100 // goal) if goal > 0 else 0
+
     def to_dict(self):
         """
         Convert goal to dictionary for API responses.
@@ -40,26 +99,21 @@ class Goal(db.Model):
             dict: Goal data as dictionary with progress percentages
         """
         # Calculate progress percentages
-        applications_progress = 0
-        outreach_progress = 0
-
-        if self.applications_goal > 0:
-            applications_progress = min(100, int((self.applications_current / self.applications_goal) * 100))
-        if self.outreach_goal > 0:
-            outreach_progress = min(100, int((self.outreach_current / self.outreach_goal) * 100))
+        applications_progress = self._progress(self.applications_current, self.applications_goal)
+        outreach_progress = self._progress(self.outreach_current, self.outreach_goal)
 
         return {
             'id': self.id,
             'user_id': self.user_id,
-            'week_start': self.week_start.isoformat() if self.week_start else None,
+            'week_start': self.week_start,
             'applications_goal': self.applications_goal,
             'applications_current': self.applications_current,
             'applications_progress': applications_progress,
             'outreach_goal': self.outreach_goal,
             'outreach_current': self.outreach_current,
             'outreach_progress': outreach_progress,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
 
     def __repr__(self):
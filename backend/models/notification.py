@@ -1,7 +1,4 @@
-from datetime import datetime
-from flask_sqlalchemy import SQLAlchemy
-
-db = SQLAlchemy()
+from . import db, IDType, utcnow
 
 class Notification(db.Model):
     """
@@ -14,28 +11,40 @@ class Notification(db.Model):
     - follow_up: Reminder to follow up on an application
     - goal_reminder: Reminder about weekly goal progress
     - micro_quest: Notification about completed micro-quests
+    - contacts_discovered: Result of a background Hunter.io contact discovery
     - system: General system alerts
     """
     __tablename__ = 'notifications'
 
     # Primary fields
-    id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    id = db.Column(IDType, db.Identity(always=False), primary_key=True)
+    user_id = db.Column(IDType, db.ForeignKey('users.id'), nullable=False)
 
     # Notification information
-    type = db.Column(db.String(50), nullable=False, index=True)  # follow_up, goal_reminder, micro_quest, system
+    type = db.Column(db.String(50), nullable=False)  # follow_up, goal_reminder, micro_quest, contacts_discovered, system
     title = db.Column(db.String(255), nullable=False)
     message = db.Column(db.Text)
 
     # Link to related item
     related_type = db.Column(db.String(50))  # application, outreach, goal, etc.
-    related_id = db.Column(db.Integer)  # ID of related item
+    related_id = db.Column(IDType)  # ID of related item
 
     # Status
-    is_read = db.Column(db.Boolean, default=False, index=True)
+    is_read = db.Column(db.Boolean, default=False)
 
     # Timestamps
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+    created_at = db.Column(db.DateTime, server_default=utcnow(), nullable=False)
+
+    # Every query filters on user_id, so each index leads with it (no standalone created_at index)
+    __table_args__ = (
+        # Notification list by read status, newest first; also serves the unread count
+        db.Index('ix_notif_user_unread', 'user_id', 'is_read', created_at.desc(), id.desc()),
+        # Notification list: user's notifications newest first
+        db.Index('ix_notif_user_created', 'user_id', created_at.desc(), id.desc()),
+        # Notification list filtered by type (type is only ever queried per user, so this
+        # replaces a standalone index on type)
+        db.Index('ix_notif_user_type_created', 'user_id', 'type', created_at.desc(), id.desc()),
+    )
 
     def to_dict(self):
         """
@@ -53,7 +62,7 @@ class Notification(db.Model):
             'related_type': self.related_type,
             'related_id': self.related_id,
             'is_read': self.is_read,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at
         }
 
     def __repr__(self):
@@ -1,7 +1,8 @@
 from datetime import datetime
-from flask_sqlalchemy import SQLAlchemy
+from . import db, JSONType, IDType
 
-db = SQLAlchemy()
+# Shared immutable stand-in for unset JSON arrays (serialized as [])
+_EMPTY = ()
 
 class OnboardingData(db.Model):
     """
@@ -13,29 +14,34 @@ class OnboardingData(db.Model):
     __tablename__ = 'onboarding_data'
 
     # Primary fields
-    id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, unique=True, index=True)
+    id = db.Column(IDType, db.Identity(always=False), primary_key=True)
+    user_id = db.Column(IDType, db.ForeignKey('users.id'), nullable=False, unique=True, index=True)
 
     # Onboarding fields (from the 7-step process)
     target_role = db.Column(db.String(255), nullable=False)  # Step 1: Target job role
     target_industry = db.Column(db.String(255))  # Step 2: Target industry
     experience_level = db.Column(db.String(50))  # Step 3: Experience level (Junior, Mid, Senior)
     dream_milestone = db.Column(db.Text)  # Step 4: Dream milestone/goal
-    skills = db.Column(db.Text)  # Step 5: Skills (JSON array stored as text)
-    preferred_locations = db.Column(db.Text)  # Step 6: Preferred locations (JSON array stored as text)
+    skills = db.Column(JSONType)  # Step 5: Skills (JSON array)
+    preferred_locations = db.Column(JSONType)  # Step 6: Preferred locations (JSON array)
     availability = db.Column(db.String(50))  # Step 7: Availability (Immediate, 1-3 months, etc.)
 
     # Completion tracking
     completed_at = db.Column(db.DateTime)
 
+    # GIN index for skill containment queries (skills @> '["Python"]'), PostgreSQL only
+    __table_args__ = (
+        db.Index('ix_onboarding_skills', 'skills',
+                 postgresql_using='gin', postgresql_ops={'skills': 'jsonb_path_ops'}).ddl_if(dialect='postgresql'),
+    )
+
     def to_dict(self):
         """
         Convert onboarding data to dictionary for API responses.
         
         Returns:
-            dict: Onboarding data as dictionary with parsed JSON arrays
+            dict: Onboarding data as dictionary
         """
-        import json
         return {
             'id': self.id,
             'user_id': self.user_id,
@@ -43,10 +49,10 @@ class OnboardingData(db.Model):
             'target_industry': self.target_industry,
             'experience_level': self.experience_level,
             'dream_milestone': self.dream_milestone,
-            'skills': json.loads(self.skills) if self.skills else [],
-            'preferred_locations': json.loads(self.preferred_locations) if self.preferred_locations else [],
+            'skills': self.skills or _EMPTY,
+            'preferred_locations': self.preferred_locations or _EMPTY,
             'availability': self.availability,
-            'completed_at': self.completed_at.isoformat() if self.completed_at else None
+            'completed_at': self.completed_at
         }
 
     def __repr__(self):
@@ -1,7 +1,4 @@
-from datetime import datetime
-from flask_sqlalchemy import SQLAlchemy
-
-db = SQLAlchemy()
+from . import db, IDType, utcnow
 
 class OutreachActivity(db.Model):
     """
@@ -13,21 +10,21 @@ class OutreachActivity(db.Model):
     __tablename__ = 'outreach_activities'
 
     # Primary fields
-    id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
-    application_id = db.Column(db.Integer, db.ForeignKey('applications.id'), nullable=True, index=True)
-    company_id = db.Column(db.Integer, db.ForeignKey('companies.id'), nullable=True, index=True)
-    contact_id = db.Column(db.Integer, db.ForeignKey('contacts.id'), nullable=False, index=True)
+    id = db.Column(IDType, db.Identity(always=False), primary_key=True)
+    user_id = db.Column(IDType, db.ForeignKey('users.id'), nullable=False)
+    application_id = db.Column(IDType, db.ForeignKey('applications.id'), nullable=True, index=True)
+    company_id = db.Column(IDType, db.ForeignKey('companies.id'), nullable=True, index=True)
+    contact_id = db.Column(IDType, db.ForeignKey('contacts.id'), nullable=False, index=True)
 
     # Outreach information
     channel = db.Column(db.String(50), nullable=False)  # 'Email' or 'LinkedIn'
     message_template = db.Column(db.Text)  # The message sent
-    sent_date = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    sent_date = db.Column(db.DateTime, server_default=utcnow(), nullable=False)
     follow_up_date = db.Column(db.DateTime)  # When to follow up
     status = db.Column(db.String(50), default='Sent')  # 'Sent', 'Responded', 'No Response'
 
     # Timestamps
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    created_at = db.Column(db.DateTime, server_default=utcnow(), nullable=False)
 
     # Critical Constraint: Exactly one of (application_id, company_id) must be non-NULL
     __table_args__ = (
@@ -35,6 +32,8 @@ class OutreachActivity(db.Model):
             '(application_id IS NOT NULL AND company_id IS NULL) OR (application_id IS NULL AND company_id IS NOT NULL)',
             name='check_outreach_link'
         ),
+        # Composite index for finding a user's upcoming follow-ups
+        db.Index('ix_outreach_user_followup', 'user_id', 'follow_up_date'),
     )
 
     def to_dict(self, include_related=False):
@@ -55,10 +54,10 @@ class OutreachActivity(db.Model):
             'contact_id': self.contact_id,
             'channel': self.channel,
             'message_template': self.message_template,
-            'sent_date': self.sent_date.isoformat() if self.sent_date else None,
-            'follow_up_date': self.follow_up_date.isoformat() if self.follow_up_date else None,
+            'sent_date': self.sent_date,
+            'follow_up_date': self.follow_up_date,
             'status': self.status,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at
         }
 
         if include_related:
@@ -72,4 +71,4 @@ class OutreachActivity(db.Model):
         return outreach_dict
 
     def __repr__(self):
-        return f'<OutreachActivity {self.channel} to {self.contact.name if self.contact else "Unknown"}>'
+        return f'<OutreachActivity {self.channel} contact_id={self.contact_id}>'
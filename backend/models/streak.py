@@ -1,7 +1,6 @@
 from datetime import datetime
-from flask_sqlalchemy import SQLAlchemy
-
-db = SQLAlchemy()
+from sqlalchemy import update
+from . import db, IDType, insert_ignore, utcnow
 
 class Streak(db.Model):
     """
@@ -14,8 +13,8 @@ class Streak(db.Model):
     __tablename__ = 'streaks'
 
     # Primary fields
-    id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, unique=True, index=True)
+    id = db.Column(IDType, db.Identity(always=False), primary_key=True)
+    user_id = db.Column(IDType, db.ForeignKey('users.id'), nullable=False, unique=True, index=True)
 
     # Streak tracking
     current_streak = db.Column(db.Integer, default=0)  # Current streak count (days)
@@ -24,8 +23,59 @@ class Streak(db.Model):
     total_points = db.Column(db.Integer, default=0)  # Gamification points
 
     # Timestamps
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at = db.Column(db.DateTime, server_default=utcnow(), nullable=False)
+    updated_at = db.Column(db.DateTime, server_default=utcnow(), onupdate=datetime.utcnow, nullable=False)
+
+    @classmethod
+    def get_or_create(cls, user_id):
+        """
+        Get the user's streak record, creating it if missing.
+        
+        Args:
+            user_id (int): ID of the user
+            
+        Returns:
+            tuple: (streak, created) where created is True if the streak was just inserted
+        """
+        streak = cls.query.filter_by(user_id=user_id).first()
+        if streak:
+            return streak, False
+
+        streak = insert_ignore(cls, ['user_id'], user_id=user_id)
+        if streak:
+            return streak, True
+
+        # Another request created it first
+        return cls.query.filter_by(user_id=user_id).one(), False
+
+    @classmethod
+    def add_points(cls, user_id, points):
+        """
+        Award points to the user, creating their streak record if missing.
+        
+        Runs a single UPDATE ... SET total_points = total_points + :points RETURNING,
+        so concurrent requests can't lose points and the updated row comes back
+        without another SELECT.
+        
+        Args:
+            user_id (int): ID of the user
+            points (int): Points to add
+            
+        Returns:
+            Streak: The updated streak
+        """
+        stmt = (
+            update(cls)
+            .where(cls.user_id == user_id)
+            .values(total_points=cls.total_points + points)
+            .returning(cls)
+        )
+        streak = db.session.scalars(stmt).one_or_none()
+        if streak is None:
+            # First activity for this user: create the record, then award the points
+            cls.get_or_create(user_id)
+            streak = db.session.scalars(stmt).one()
+        return streak
 
     def to_dict(self):
         """
@@ -39,10 +89,10 @@ class Streak(db.Model):
             'user_id': self.user_id,
             'current_streak': self.current_streak,
             'longest_streak': self.longest_streak,
-            'last_activity_date': self.last_activity_date.isoformat() if self.last_activity_date else None,
+            'last_activity_date': self.last_activity_date,
             'total_points': self.total_points,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
 
     def __repr__(self):
@@ -1,8 +1,51 @@
+import os
+import threading
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
-from flask_sqlalchemy import SQLAlchemy
+from werkzeug.security import check_password_hash
+from argon2 import PasswordHasher
+from argon2.exceptions import VerifyMismatchError, VerificationError, InvalidHashError
+from sqlalchemy import select, func
+from . import db, IDType, utcnow
+from .application import Application
+from .company import Company
+from .outreach import OutreachActivity
+from .cv_analysis import CVAnalysis
+
+# Argon2id hasher (argon2-cffi defaults: time_cost=3, memory_cost=64 MiB, parallelism=4).
+# Raise the costs here if logins on production hardware take well under ~100ms.
+password_hasher = PasswordHasher()
+
+# Hash verified when no account matches a login, so both paths cost the same
+_DUMMY_HASH = password_hasher.hash('dummy-password')
+
+# Cap concurrent Argon2 hashes at the CPU count, so a burst of logins can't oversubscribe
+# CPU and memory (64 MiB each). Hashing runs in the request thread, which argon2-cffi
+# already lets other threads run alongside (GIL released); the cap only makes excess
+# logins wait their turn.
+_hash_slots = threading.BoundedSemaphore(os.cpu_count() or 1)
+
+
+def _run_hash(fn, *args):
+    """Run a password hashing function once a hashing slot is free."""
+    with _hash_slots:
+        return fn(*args)
+
+
+def verify_dummy_password(password):
+    """
+    Run a full Argon2 verification that always fails.
+    
+    Used when a login email has no account so the response time does not
+    reveal whether the email is registered.
+    
+    Args:
+        password (str): Plain text password from the request
+    """
+    try:
+        _run_hash(password_hasher.verify, _DUMMY_HASH, password)
+    except VerifyMismatchError:
+        pass
 
-db = SQLAlchemy()
 
 class User(db.Model):
     """
@@ -14,46 +57,122 @@ class User(db.Model):
     __tablename__ = 'users'
 
     # Primary fields
-    id = db.Column(db.Integer, primary_key=True)
+    id = db.Column(IDType, db.Identity(always=False), primary_key=True)
     email = db.Column(db.String(255), unique=True, nullable=False, index=True)
     password_hash = db.Column(db.String(255), nullable=False)
     name = db.Column(db.String(255), nullable=False)
 
     # Timestamps
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at = db.Column(db.DateTime, server_default=utcnow(), nullable=False)
+    updated_at = db.Column(db.DateTime, server_default=utcnow(), onupdate=datetime.utcnow, nullable=False)
 
     # Relationships (defined as we create other models)
     onboarding = db.relationship('OnboardingData', backref='user', uselist=False, cascade='all, delete-orphan')
-    applications = db.relationship('Application', backref='user', lazy='dynamic', cascade='all, delete-orphan')
-    companies = db.relationship('Company', backref='user', lazy='dynamic', cascade='all, delete-orphan')
-    contacts = db.relationship('Contact', backref='user', lazy='dynamic', cascade='all, delete-orphan')
-    outreach_activities = db.relationship('OutreachActivity', backref='user', lazy='dynamic', cascade='all, delete-orphan')
-    cv_analyses = db.relationship('CVAnalysis', backref='user', lazy='dynamic', cascade='all, delete-orphan')
-    goals = db.relationship('Goal', backref='user', lazy='dynamic', cascade='all, delete-orphan')
+    applications = db.relationship('Application', backref='user', cascade='all, delete-orphan')
+    companies = db.relationship('Company', backref='user', cascade='all, delete-orphan')
+    contacts = db.relationship('Contact', backref='user', cascade='all, delete-orphan')
+    outreach_activities = db.relationship('OutreachActivity', backref='user', cascade='all, delete-orphan')
+    cv_analyses = db.relationship('CVAnalysis', backref='user', cascade='all, delete-orphan')
+    goals = db.relationship('Goal', backref='user', cascade='all, delete-orphan')
     streak = db.relationship('Streak', backref='user', uselist=False, cascade='all, delete-orphan')
-    notifications = db.relationship('Notification', backref='user', lazy='dynamic', cascade='all, delete-orphan')
+    notifications = db.relationship('Notification', backref='user', cascade='all, delete-orphan')
+
+    @staticmethod
+    def hash_password(password):
+        """
+        Hash a password with Argon2id.
+        
+        Args:
+            password (str): Plain text password to hash
+            
+        Returns:
+            str: Encoded Argon2id hash
+        """
+        return _run_hash(password_hasher.hash, password)
 
     def set_password(self, password):
         """
-        Hash and set user password using Werkzeug's security functions.
+        Hash and set user password with Argon2id.
         
         Args:
             password (str): Plain text password to hash
         """
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = self.hash_password(password)
+
+    @staticmethod
+    def _verify_hash(password_hash, password):
+        """Check a password against an Argon2 or legacy Werkzeug hash."""
+        if not password_hash.startswith('$argon2'):
+            return _run_hash(check_password_hash, password_hash, password)
+
+        try:
+            _run_hash(password_hasher.verify, password_hash, password)
+        except (VerifyMismatchError, VerificationError, InvalidHashError):
+            return False
+        return True
 
     def check_password(self, password):
         """
         Verify password against stored hash.
         
+        Hashes created before the switch to Argon2 (Werkzeug's pbkdf2/scrypt) are
+        still accepted. On success, the stored hash is upgraded to Argon2id with the
+        current parameters when needed; the caller must commit to persist it.
+        
         Args:
             password (str): Plain text password to verify
             
         Returns:
             bool: True if password matches, False otherwise
         """
-        return check_password_hash(self.password_hash, password)
+        if not self._verify_hash(self.password_hash, password):
+            return False
+
+        if not self.password_hash.startswith('$argon2') or password_hasher.check_needs_rehash(self.password_hash):
+            self.set_password(password)
+        return True
+
+    @classmethod
+    def verify_password_by_id(cls, user_id, password):
+        """
+        Verify a user's password, fetching only the password hash column.
+        
+        Unlike check_password, this never upgrades the stored hash, so it suits
+        callers that are about to replace the password anyway.
+        
+        Args:
+            user_id (int): ID of the user
+            password (str): Plain text password to verify
+            
+        Returns:
+            bool: True if the user exists and the password matches
+        """
+        password_hash = db.session.query(cls.password_hash).filter(cls.id == user_id).scalar()
+        return password_hash is not None and cls._verify_hash(password_hash, password)
+
+    def get_stats(self):
+        """
+        Count the user's records with a single query.
+        
+        Returns:
+            dict: Totals of applications, companies, outreach activities and CV analyses
+        """
+        def count_for(model):
+            return select(func.count(model.id)).where(model.user_id == self.id).scalar_subquery()
+
+        applications, companies, outreach, cv_analyses = db.session.query(
+            count_for(Application),
+            count_for(Company),
+            count_for(OutreachActivity),
+            count_for(CVAnalysis)
+        ).one()
+
+        return {
+            'total_applications': applications,
+            'total_companies': companies,
+            'total_outreach': outreach,
+            'total_cv_analyses': cv_analyses
+        }
 
     def to_dict(self, include_stats=False):
         """
@@ -69,17 +188,12 @@ class User(db.Model):
             'id': self.id,
             'email': self.email,
             'name': self.name,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at
         }
 
         if include_stats:
             # Add statistics if requested
-            user_dict['stats'] = {
-                'total_applications': self.applications.count(),
-                'total_companies': self.companies.count(),
-                'total_outreach': self.outreach_activities.count(),
-                'total_cv_analyses': self.cv_analyses.count()
-            }
+            user_dict['stats'] = self.get_stats()
 
         return user_dict
 
@@ -4,25 +4,44 @@ Applications routes for the JobBuddy API.
 This module handles job application tracking with Kanban board functionality.
 """
 
-from flask import Blueprint, request, jsonify
-from datetime import datetime, timedelta, date
+from flask import Blueprint, request, jsonify, current_app
 import csv
 import io
+from sqlalchemy import insert
+from sqlalchemy.orm import joinedload, raiseload
 from models import db
-from models.application import Application
+from models.application import Application, VALID_STATUSES
 from models.company import Company
 from models.goal import Goal
 from models.notification import Notification
-from utils.validators import validate_job_title
-from utils.error_handlers import APIError
+from utils.validators import validate_job_title, validate_file_type, validate_file_stream
+from utils.error_handlers import APIError, server_error_response
+from utils.cache import cached_list, invalidate_lists
 from utils.decorators import login_required
+from utils.request_time import request_today, request_week_start
+from utils.pagination import normalize_page_args, count_rows, page_count, before_cursor, require_cursor_row
 
 # Create Blueprint for applications routes
 applications_bp = Blueprint('applications', __name__, url_prefix='/api/v1/applications')
 
+# Columns of the application list view (everything but notes, plus the company name)
+_SUMMARY_COLUMNS = (
+    Application.id,
+    Application.user_id,
+    Application.company_id,
+    Application.job_title,
+    Application.job_url,
+    Application.status,
+    Application.applied_date,
+    Application.created_at,
+    Application.updated_at,
+    Company.name.label('company_name')
+)
+
 
 @applications_bp.route('', methods=['GET'])
 @login_required
+@cached_list('apps')
 def list_applications():
     """
     Get all applications for the current user.
@@ -33,9 +52,12 @@ def list_applications():
     - search: Search by job title or company name
     - page: Page number (default: 1)
     - per_page: Items per page (default: 10)
+    - mode: 'cursor' for infinite scroll (no total count; pass back next_cursor as cursor)
+    - cursor: Cursor returned by the previous page in cursor mode
     
     Returns:
-        JSON with list of applications and pagination info
+        JSON with list of application summaries (no notes; company id and name only)
+        and pagination info
     """
     try:
         user_id = request.user_id
@@ -44,8 +66,11 @@ def list_applications():
         status = request.args.get('status', '').strip()
         company_id = request.args.get('company_id', type=int)
         search = request.args.get('search', '').strip()
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
+        mode = request.args.get('mode', '').strip()
+        page, per_page = normalize_page_args(
+            request.args.get('page', 1, type=int),
+            request.args.get('per_page', 10, type=int)
+        )
         
         # Build query
         query = Application.query.filter_by(user_id=user_id)
@@ -56,30 +81,85 @@ def list_applications():
         if company_id:
             query = query.filter_by(company_id=company_id)
         
+        # Substring search (uses the job title trigram index on PostgreSQL)
         if search:
             query = query.filter(Application.job_title.ilike(f'%{search}%'))
         
-        # Order by created_at descending
-        query = query.order_by(Application.created_at.desc())
+        # Cursor mode: fetch one extra row to know whether another page exists, skip the count
+        if mode == 'cursor':
+            cursor = request.args.get('cursor')
+            if cursor:
+                query = query.filter(before_cursor(Application.created_at, Application.id, cursor))
+            
+            items = _page_query(query).limit(per_page + 1).all()
+            has_more = len(items) > per_page
+            items = items[:per_page]
+            if cursor and not items:
+                # Empty page: make sure it's the end of the list, not a deleted cursor row
+                require_cursor_row(Application.id, cursor, user_id)
+            
+            return jsonify({
+                'applications': [_summary_dict(row) for row in items],
+                'pagination': {
+                    'per_page': per_page,
+                    'has_more': has_more,
+                    'next_cursor': str(items[-1].id) if has_more else None
+                }
+            }), 200
         
-        # Paginate
-        paginated = query.paginate(page=page, per_page=per_page, error_out=False)
+        # Paginate (count straight off the filtered table, without ordering or eager loads)
+        total = count_rows(query, Application.id)
+        items = _page_query(query).limit(per_page).offset((page - 1) * per_page).all()
         
-        applications = [app.to_dict(include_company=True) for app in paginated.items]
+        applications = [_summary_dict(row) for row in items]
         
         return jsonify({
             'applications': applications,
             'pagination': {
                 'page': page,
                 'per_page': per_page,
-                'total': paginated.total,
-                'pages': paginated.pages
+                'total': total,
+                'pages': page_count(total, per_page)
             }
         }), 200
         
+    except APIError as e:
+        return jsonify(e.to_dict()), e.status_code
     except Exception as e:
-        error = APIError(str(e), 500)
-        return jsonify(error.to_dict()), 500
+        return server_error_response(e)
+
+
+def _page_query(query):
+    """
+    Select the list view columns for a filtered application query, newest first.
+    
+    Read-only listing: returns plain rows of the summary columns, with the company
+    name joined in, instead of hydrating Application and Company objects.
+    
+    Args:
+        query: Filtered Application query
+        
+    Returns:
+        Query of summary rows ordered newest first (id breaks ties between rows created together)
+    """
+    return query.join(Application.company).with_entities(*_SUMMARY_COLUMNS).order_by(
+        Application.created_at.desc(), Application.id.desc()
+    )
+
+
+def _summary_dict(row):
+    """
+    Convert a summary row from _page_query() to the list view dictionary.
+    
+    Args:
+        row: Row of _SUMMARY_COLUMNS
+        
+    Returns:
+        dict: Application summary (no notes; company id and name only)
+    """
+    app_dict = row._asdict()
+    app_dict['company'] = {'id': row.company_id, 'name': app_dict.pop('company_name')}
+    return app_dict
 
 
 @applications_bp.route('', methods=['POST'])
@@ -110,24 +190,24 @@ def create_application():
         company_id = data.get('company_id')
         job_title = validate_job_title(data.get('job_title'))
         
-        # Verify company exists and belongs to user
+        # Verify company exists and belongs to user. The row is loaded once and reused
+        # for the notification text and the response's company block.
         company = Company.query.filter_by(id=company_id, user_id=user_id).first()
-        if not company:
+        if company is None:
             raise APIError('Company not found', 404)
         
         # Create application
         status = data.get('status', 'Planned')
-        valid_statuses = ['Planned', 'Applied', 'Interview', 'Offer', 'Rejected']
-        if status not in valid_statuses:
+        if status not in VALID_STATUSES:
             status = 'Planned'
         
         application = Application(
             user_id=user_id,
-            company_id=company_id,
+            company=company,
             job_title=job_title,
             job_url=data.get('job_url', '').strip() or None,
             status=status,
-            applied_date=datetime.utcnow().date() if status == 'Applied' else None,
+            applied_date=request_today() if status == 'Applied' else None,
             notes=data.get('notes', '').strip() or None
         )
         
@@ -136,7 +216,6 @@ def create_application():
         
         # If status is Applied, create follow-up notification
         if status == 'Applied':
-            follow_up_date = datetime.utcnow() + timedelta(days=3)
             notification = Notification(
                 user_id=user_id,
                 type='follow_up',
@@ -148,17 +227,20 @@ def create_application():
             db.session.add(notification)
             
             # Increment weekly goal counter
-            today = datetime.utcnow().date()
-            week_start = today - timedelta(days=today.weekday())
-            goal = Goal.query.filter_by(user_id=user_id, week_start=week_start).first()
-            if goal:
-                goal.applications_current += 1
+            Goal.increment_applications(user_id, request_week_start())
         
+        # Serialize inside the transaction: the INSERT already returned the generated
+        # columns, so this avoids re-selecting the row after commit expires it
+        application_data = application.to_dict(include_company=True)
         db.session.commit()
+        if status == 'Applied':
+            invalidate_lists(user_id, 'apps', 'companies', 'notifications')
+        else:
+            invalidate_lists(user_id, 'apps', 'companies')
         
         return jsonify({
             'message': 'Application created successfully',
-            'application': application.to_dict(include_company=True)
+            'application': application_data
         }), 201
         
     except APIError as e:
@@ -166,8 +248,7 @@ def create_application():
         return jsonify(e.to_dict()), e.status_code
     except Exception as e:
         db.session.rollback()
-        error = APIError(str(e), 500)
-        return jsonify(error.to_dict()), 500
+        return server_error_response(e)
 
 
 @applications_bp.route('/<int:id>', methods=['GET'])
@@ -182,8 +263,13 @@ def get_application(id):
     try:
         user_id = request.user_id
         
-        application = Application.query.filter_by(id=id, user_id=user_id).first()
-        if not application:
+        # Primary-key lookup (served from the identity map if already loaded); the company
+        # comes in the same statement and any other relationship access raises
+        application = db.session.get(
+            Application, id,
+            options=[joinedload(Application.company), raiseload('*')]
+        )
+        if not application or application.user_id != user_id:
             raise APIError('Application not found', 404)
         
         return jsonify({
@@ -193,8 +279,7 @@ def get_application(id):
     except APIError as e:
         return jsonify(e.to_dict()), e.status_code
     except Exception as e:
-        error = APIError(str(e), 500)
-        return jsonify(error.to_dict()), 500
+        return server_error_response(e)
 
 
 @applications_bp.route('/<int:id>', methods=['PUT'])
@@ -217,11 +302,12 @@ def update_application(id):
         user_id = request.user_id
         data = request.get_json()
         
-        application = Application.query.filter_by(id=id, user_id=user_id).first()
-        if not application:
+        application = db.session.get(Application, id)
+        if not application or application.user_id != user_id:
             raise APIError('Application not found', 404)
         
         old_status = application.status
+        became_applied = False
         
         # Update fields
         if 'job_title' in data:
@@ -230,39 +316,54 @@ def update_application(id):
             application.job_url = data.get('job_url', '').strip() or None
         if 'status' in data:
             new_status = data.get('status')
-            valid_statuses = ['Planned', 'Applied', 'Interview', 'Offer', 'Rejected']
-            if new_status in valid_statuses:
+            if new_status in VALID_STATUSES:
                 application.status = new_status
                 
-                # If status changed to Applied, set applied_date and create notification
+                # If status changed to Applied, set applied_date
                 if old_status != 'Applied' and new_status == 'Applied':
-                    application.applied_date = datetime.utcnow().date()
-                    
-                    notification = Notification(
-                        user_id=user_id,
-                        type='follow_up',
-                        title='Follow up on application',
-                        message=f'Remember to follow up on your application to {application.company.name} for {application.job_title}',
-                        related_type='application',
-                        related_id=application.id
-                    )
-                    db.session.add(notification)
-                    
-                    # Increment weekly goal counter
-                    today = datetime.utcnow().date()
-                    week_start = today - timedelta(days=today.weekday())
-                    goal = Goal.query.filter_by(user_id=user_id, week_start=week_start).first()
-                    if goal:
-                        goal.applications_current += 1
+                    application.applied_date = request_today()
+                    became_applied = True
         
         if 'notes' in data:
             application.notes = data.get('notes', '').strip() or None
         
-        db.session.commit()
+        # Only write when a value actually changed. Checked here, before the company
+        # load and goal UPDATE below autoflush the application and clear its changes.
+        modified = db.session.is_modified(application)
+        
+        # Follow-up notification and goal increment go after all field changes, so the
+        # application is written in a single UPDATE. The company loaded for the message
+        # is reused by the response.
+        if became_applied:
+            notification = Notification(
+                user_id=user_id,
+                type='follow_up',
+                title='Follow up on application',
+                message=f'Remember to follow up on your application to {application.company.name} for {application.job_title}',
+                related_type='application',
+                related_id=application.id
+            )
+            db.session.add(notification)
+            
+            # Increment weekly goal counter
+            Goal.increment_applications(user_id, request_week_start())
+        
+        # A status change to Applied always counts as modified, so its notification and
+        # goal increment are committed with it. Flush and serialize before committing so
+        # the row isn't re-selected afterwards.
+        if modified:
+            db.session.flush()
+        application_data = application.to_dict(include_company=True)
+        if modified:
+            db.session.commit()
+            if became_applied:
+                invalidate_lists(user_id, 'apps', 'notifications')
+            else:
+                invalidate_lists(user_id, 'apps')
         
         return jsonify({
             'message': 'Application updated successfully',
-            'application': application.to_dict(include_company=True)
+            'application': application_data
         }), 200
         
     except APIError as e:
@@ -270,8 +371,7 @@ def update_application(id):
         return jsonify(e.to_dict()), e.status_code
     except Exception as e:
         db.session.rollback()
-        error = APIError(str(e), 500)
-        return jsonify(error.to_dict()), 500
+        return server_error_response(e)
 
 
 @applications_bp.route('/<int:id>', methods=['DELETE'])
@@ -286,12 +386,13 @@ def delete_application(id):
     try:
         user_id = request.user_id
         
-        application = Application.query.filter_by(id=id, user_id=user_id).first()
-        if not application:
+        application = db.session.get(Application, id)
+        if not application or application.user_id != user_id:
             raise APIError('Application not found', 404)
         
         db.session.delete(application)
         db.session.commit()
+        invalidate_lists(user_id, 'apps', 'companies')
         
         return jsonify({
             'message': 'Application deleted successfully'
@@ -302,8 +403,7 @@ def delete_application(id):
         return jsonify(e.to_dict()), e.status_code
     except Exception as e:
         db.session.rollback()
-        error = APIError(str(e), 500)
-        return jsonify(error.to_dict()), 500
+        return server_error_response(e)
 
 
 @applications_bp.route('/bulk-upload', methods=['POST'])
@@ -328,17 +428,19 @@ def bulk_upload_applications():
         if not file or file.filename == '':
             raise APIError('No file selected', 400)
         
-        if not file.filename.endswith('.csv'):
-            raise APIError('File must be CSV format', 400)
+        # Check the extension first so a wrong file type is rejected before any bytes are read
+        validate_file_type(file.filename, {'csv'})
+        validate_file_stream(file, current_app.config['MAX_UPLOAD_MB'])
         
-        # Read CSV
-        stream = io.StringIO(file.stream.read().decode('UTF8'), newline=None)
+        # Read CSV line by line from the upload stream instead of buffering it all
+        stream = io.TextIOWrapper(file.stream, encoding='utf-8', newline='')
         csv_reader = csv.DictReader(stream)
         
-        successful = 0
         failed = 0
         errors = []
         
+        # Parse and validate every row first
+        parsed_rows = []
         for row in csv_reader:
             try:
                 company_name = row.get('company_name', '').strip()
@@ -349,37 +451,62 @@ def bulk_upload_applications():
                     errors.append('Company name is required')
                     continue
                 
-                # Find or create company
-                company = Company.query.filter_by(user_id=user_id, name=company_name).first()
-                if not company:
-                    company = Company(user_id=user_id, name=company_name)
-                    db.session.add(company)
-                    db.session.flush()
-                
-                # Create application
                 status = row.get('status', 'Planned')
-                valid_statuses = ['Planned', 'Applied', 'Interview', 'Offer', 'Rejected']
-                if status not in valid_statuses:
+                if status not in VALID_STATUSES:
                     status = 'Planned'
                 
-                application = Application(
-                    user_id=user_id,
-                    company_id=company.id,
-                    job_title=job_title,
-                    job_url=row.get('job_url', '').strip() or None,
-                    status=status,
-                    applied_date=datetime.utcnow().date() if status == 'Applied' else None,
-                    notes=row.get('notes', '').strip() or None
-                )
-                
-                db.session.add(application)
-                successful += 1
+                parsed_rows.append({
+                    'company_name': company_name,
+                    'job_title': job_title,
+                    'job_url': row.get('job_url', '').strip() or None,
+                    'status': status,
+                    'notes': row.get('notes', '').strip() or None
+                })
                 
             except Exception as e:
                 failed += 1
                 errors.append(str(e))
         
+        # Find all referenced companies in one query, then create the missing ones with a single flush
+        company_names = {row['company_name'] for row in parsed_rows}
+        companies = {}
+        if company_names:
+            companies = {
+                company.name: company
+                for company in Company.query.filter(
+                    Company.user_id == user_id,
+                    Company.name.in_(company_names)
+                ).all()
+            }
+        
+        new_companies = [Company(user_id=user_id, name=name) for name in company_names if name not in companies]
+        if new_companies:
+            db.session.add_all(new_companies)
+            db.session.flush()
+            companies.update((company.name, company) for company in new_companies)
+        
+        # Insert all applications as one executemany INSERT of plain rows (no ORM objects,
+        # and no RETURNING since the new ids aren't needed). render_nulls keeps rows with
+        # empty fields in the same batch instead of grouping them by which keys are set.
+        today = request_today()
+        application_rows = [
+            {
+                'user_id': user_id,
+                'company_id': companies[row['company_name']].id,
+                'job_title': row['job_title'],
+                'job_url': row['job_url'],
+                'status': row['status'],
+                'applied_date': today if row['status'] == 'Applied' else None,
+                'notes': row['notes']
+            }
+            for row in parsed_rows
+        ]
+        if application_rows:
+            db.session.execute(insert(Application).execution_options(render_nulls=True), application_rows)
+        successful = len(application_rows)
+        
         db.session.commit()
+        invalidate_lists(user_id, 'apps', 'companies')
         
         return jsonify({
             'message': f'Bulk upload completed: {successful} successful, {failed} failed',
@@ -393,5 +520,4 @@ def bulk_upload_applications():
         return jsonify(e.to_dict()), e.status_code
     except Exception as e:
         db.session.rollback()
-        error = APIError(str(e), 500)
-        return jsonify(error.to_dict()), 500
+        return server_error_response(e)
@@ -6,14 +6,14 @@ This module handles user registration, login, logout, and password recovery.
 
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
-from datetime import datetime
 from models import db
-from models.user import User
+from models.user import User, verify_dummy_password
 from models.streak import Streak
 from models.goal import Goal
 from utils.validators import validate_email, validate_password, validate_job_title
-from utils.error_handlers import APIError
+from utils.error_handlers import APIError, server_error_response
 from utils.decorators import login_required
+from utils.request_time import request_week_start
 
 # Create Blueprint for auth routes
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/v1/auth')
@@ -69,11 +69,7 @@ def register():
         db.session.add(streak)
         
         # Create initial goal record (for current week)
-        from datetime import datetime, timedelta
-        today = datetime.utcnow().date()
-        week_start = today - timedelta(days=today.weekday())  # Monday of current week
-        
-        goal = Goal(user_id=user.id, week_start=week_start)
+        goal = Goal(user_id=user.id, week_start=request_week_start())
         db.session.add(goal)
         
         db.session.commit()
@@ -92,8 +88,7 @@ def register():
         return jsonify(e.to_dict()), e.status_code
     except Exception as e:
         db.session.rollback()
-        error = APIError(str(e), 500)
-        return jsonify(error.to_dict()), 500
+        return server_error_response(e)
 
 
 @auth_bp.route('/login', methods=['POST'])
@@ -122,8 +117,16 @@ def login():
         
         # Find user by email
         user = User.query.filter_by(email=email).first()
-        if not user or not user.check_password(password):
+        if not user:
+            # Spend the same hashing time as a real check so unknown emails can't be detected by timing
+            verify_dummy_password(password)
             raise APIError('Invalid email or password', 401, 'INVALID_CREDENTIALS')
+        if not user.check_password(password):
+            raise APIError('Invalid email or password', 401, 'INVALID_CREDENTIALS')
+        
+        # Persist the hash if check_password() upgraded it
+        if user in db.session.dirty:
+            db.session.commit()
         
         # Create JWT token
         access_token = create_access_token(identity=user.id)
@@ -137,8 +140,7 @@ def login():
     except APIError as e:
         return jsonify(e.to_dict()), e.status_code
     except Exception as e:
-        error = APIError(str(e), 500)
-        return jsonify(error.to_dict()), 500
+        return server_error_response(e)
 
 
 @auth_bp.route('/logout', methods=['POST'])
@@ -195,5 +197,4 @@ def password_recovery():
     except APIError as e:
         return jsonify(e.to_dict()), e.status_code
     except Exception as e:
-        error = APIError(str(e), 500)
-        return jsonify(error.to_dict()), 500
+        return server_error_response(e)
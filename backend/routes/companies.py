@@ -5,10 +5,12 @@ This module handles company management operations.
 """
 
 from flask import Blueprint, request, jsonify
+from sqlalchemy.orm import undefer_group, joinedload, raiseload
 from models import db
 from models.company import Company
-from models.contact import Contact
-from utils.error_handlers import APIError
+from utils.error_handlers import APIError, server_error_response
+from utils.cache import cached_list, invalidate_lists
+from utils.pagination import normalize_page_args, count_rows, page_count
 from utils.decorators import login_required, owner_required
 
 # Create Blueprint for companies routes
@@ -17,6 +19,7 @@ companies_bp = Blueprint('companies', __name__, url_prefix='/api/v1/companies')
 
 @companies_bp.route('', methods=['GET'])
 @login_required
+@cached_list('companies')
 def list_companies():
     """
     Get all companies for the current user.
@@ -34,33 +37,43 @@ def list_companies():
         
         # Get query parameters
         search = request.args.get('search', '').strip()
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
+        page, per_page = normalize_page_args(
+            request.args.get('page', 1, type=int),
+            request.args.get('per_page', 10, type=int)
+        )
         
         # Build query
         query = Company.query.filter_by(user_id=user_id)
         
+        # Substring search (uses the name trigram index on PostgreSQL)
         if search:
             query = query.filter(Company.name.ilike(f'%{search}%'))
         
-        # Paginate
-        paginated = query.paginate(page=page, per_page=per_page, error_out=False)
+        # Paginate. The count runs straight off the filtered table; only the page query
+        # loads the related counts (in the same SELECT)
+        total = count_rows(query, Company.id)
+        items = (
+            query.options(undefer_group('related_counts'))
+            .order_by(Company.id)
+            .limit(per_page)
+            .offset((page - 1) * per_page)
+            .all()
+        )
         
-        companies = [company.to_dict(include_related=True) for company in paginated.items]
+        companies = [company.to_dict(include_related=True) for company in items]
         
         return jsonify({
             'companies': companies,
             'pagination': {
                 'page': page,
                 'per_page': per_page,
-                'total': paginated.total,
-                'pages': paginated.pages
+                'total': total,
+                'pages': page_count(total, per_page)
             }
         }), 200
         
     except Exception as e:
-        error = APIError(str(e), 500)
-        return jsonify(error.to_dict()), 500
+        return server_error_response(e)
 
 
 @companies_bp.route('', methods=['POST'])
@@ -100,6 +113,7 @@ def create_company():
         
         db.session.add(company)
         db.session.commit()
+        invalidate_lists(user_id, 'companies')
         
         return jsonify({
             'message': 'Company created successfully',
@@ -111,8 +125,7 @@ def create_company():
         return jsonify(e.to_dict()), e.status_code
     except Exception as e:
         db.session.rollback()
-        error = APIError(str(e), 500)
-        return jsonify(error.to_dict()), 500
+        return server_error_response(e)
 
 
 @companies_bp.route('/<int:id>', methods=['GET'])
@@ -127,13 +140,15 @@ def get_company(id):
     try:
         user_id = request.user_id
         
-        company = Company.query.filter_by(id=id, user_id=user_id).first()
-        if not company:
+        # Load the company's contacts in the same statement
+        company = db.session.get(
+            Company, id,
+            options=[undefer_group('related_counts'), joinedload(Company.contacts), raiseload('*')]
+        )
+        if not company or company.user_id != user_id:
             raise APIError('Company not found', 404)
         
-        # Get contacts for this company
-        contacts = Contact.query.filter_by(company_id=id).all()
-        contacts_data = [contact.to_dict() for contact in contacts]
+        contacts_data = [contact.to_dict() for contact in company.contacts]
         
         company_data = company.to_dict(include_related=True)
         company_data['contacts'] = contacts_data
@@ -145,8 +160,7 @@ def get_company(id):
     except APIError as e:
         return jsonify(e.to_dict()), e.status_code
     except Exception as e:
-        error = APIError(str(e), 500)
-        return jsonify(error.to_dict()), 500
+        return server_error_response(e)
 
 
 @companies_bp.route('/<int:id>', methods=['PUT'])
@@ -171,8 +185,8 @@ def update_company(id):
         user_id = request.user_id
         data = request.get_json()
         
-        company = Company.query.filter_by(id=id, user_id=user_id).first()
-        if not company:
+        company = db.session.get(Company, id)
+        if not company or company.user_id != user_id:
             raise APIError('Company not found', 404)
         
         # Update fields
@@ -187,7 +201,10 @@ def update_company(id):
         if 'notes' in data:
             company.notes = data.get('notes', '').strip() or None
         
-        db.session.commit()
+        # Only write when a value actually changed (a no-op PUT skips the UPDATE and COMMIT)
+        if db.session.is_modified(company):
+            db.session.commit()
+            invalidate_lists(user_id, 'companies', 'apps')
         
         return jsonify({
             'message': 'Company updated successfully',
@@ -199,8 +216,7 @@ def update_company(id):
         return jsonify(e.to_dict()), e.status_code
     except Exception as e:
         db.session.rollback()
-        error = APIError(str(e), 500)
-        return jsonify(error.to_dict()), 500
+        return server_error_response(e)
 
 
 @companies_bp.route('/<int:id>', methods=['DELETE'])
@@ -215,12 +231,13 @@ def delete_company(id):
     try:
         user_id = request.user_id
         
-        company = Company.query.filter_by(id=id, user_id=user_id).first()
-        if not company:
+        company = db.session.get(Company, id)
+        if not company or company.user_id != user_id:
             raise APIError('Company not found', 404)
         
         db.session.delete(company)
         db.session.commit()
+        invalidate_lists(user_id, 'companies', 'apps', 'contacts')
         
         return jsonify({
             'message': 'Company deleted successfully'
@@ -231,5 +248,4 @@ def delete_company(id):
         return jsonify(e.to_dict()), e.status_code
     except Exception as e:
         db.session.rollback()
-        error = APIError(str(e), 500)
-        return jsonify(error.to_dict()), 500
+        return server_error_response(e)
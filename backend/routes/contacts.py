@@ -5,13 +5,19 @@ This module handles contact management operations including manual entry
 and Hunter.io API integration for contact discovery.
 """
 
-from flask import Blueprint, request, jsonify
+from concurrent.futures import ThreadPoolExecutor
+from flask import Blueprint, request, jsonify, current_app
+import orjson
 import requests
-from models import db
+from sqlalchemy import bindparam, or_
+from models import db, insert_ignore_many
 from models.contact import Contact
 from models.company import Company
-from utils.error_handlers import APIError
+from models.notification import Notification
+from utils.error_handlers import APIError, server_error_response
+from utils.cache import cached_list, invalidate_lists
 from utils.decorators import login_required
+from utils.pagination import normalize_page_args, count_rows, page_count, decode_cursor
 from config import get_config
 
 # Create Blueprint for contacts routes
@@ -19,9 +25,44 @@ contacts_bp = Blueprint('contacts', __name__, url_prefix='/api/v1/contacts')
 
 config = get_config()
 
+# Hunter.io lookups run here instead of on request threads. Kept small to bound
+# concurrent calls against the API quota; threads start on first use.
+_DISCOVERY_WORKERS = 4
+_discovery_pool = ThreadPoolExecutor(max_workers=_DISCOVERY_WORKERS, thread_name_prefix='contact-discovery')
+
+# Shared HTTP session so Hunter.io calls reuse kept-alive TLS connections
+# (one pooled connection per discovery thread)
+_hunter_session = requests.Session()
+_hunter_session.mount('https://', requests.adapters.HTTPAdapter(pool_maxsize=_DISCOVERY_WORKERS))
+
+# List query pieces built once at import; only the bound values change per request,
+# so each query shape hits SQLAlchemy's compiled statement cache
+_LIST_COLUMNS = tuple(Contact.__table__.columns)
+_SEARCH_FILTER = or_(
+    Contact.name.ilike(bindparam('search_pattern')),
+    Contact.email.ilike(bindparam('search_pattern'))
+)
+
+
+def _email_taken(company_id, email):
+    """
+    Check whether a company already has a contact with an email.
+    
+    Args:
+        company_id (int): ID of the company
+        email (str): Email address to check
+        
+    Returns:
+        bool: True if a contact with the email exists
+    """
+    return db.session.query(
+        Contact.query.filter_by(company_id=company_id, email=email).exists()
+    ).scalar()
+
 
 @contacts_bp.route('', methods=['GET'])
 @login_required
+@cached_list('contacts')
 def list_contacts():
     """
     Get all contacts for the current user.
@@ -31,6 +72,8 @@ def list_contacts():
     - search: Search by contact name or email
     - page: Page number (default: 1)
     - per_page: Items per page (default: 10)
+    - mode: 'cursor' for infinite scroll (no total count; pass back next_cursor as cursor)
+    - cursor: Cursor returned by the previous page in cursor mode
     
     Returns:
         JSON with list of contacts and pagination info
@@ -41,39 +84,62 @@ def list_contacts():
         # Get query parameters
         company_id = request.args.get('company_id', type=int)
         search = request.args.get('search', '').strip()
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
+        mode = request.args.get('mode', '').strip()
+        page, per_page = normalize_page_args(
+            request.args.get('page', 1, type=int),
+            request.args.get('per_page', 10, type=int)
+        )
         
-        # Build query
-        query = Contact.query.filter_by(user_id=user_id)
+        # Build query (read-only listing: select plain rows of the contact columns
+        # instead of hydrating Contact objects; the row keys match Contact.to_dict())
+        query = Contact.query.with_entities(*_LIST_COLUMNS).filter(Contact.user_id == user_id)
         
         if company_id:
-            query = query.filter_by(company_id=company_id)
+            query = query.filter(Contact.company_id == company_id)
         
+        # Substring search (on PostgreSQL each side uses its trigram index, combined with a BitmapOr)
         if search:
-            query = query.filter(
-                (Contact.name.ilike(f'%{search}%')) | 
-                (Contact.email.ilike(f'%{search}%'))
-            )
+            query = query.filter(_SEARCH_FILTER).params(search_pattern=f'%{search}%')
         
-        # Paginate
-        paginated = query.paginate(page=page, per_page=per_page, error_out=False)
+        # Cursor mode: seek past the last id of the previous page instead of OFFSET, and skip the count
+        if mode == 'cursor':
+            cursor = request.args.get('cursor')
+            if cursor:
+                query = query.filter(Contact.id > decode_cursor(cursor))
+            
+            rows = query.order_by(Contact.id).limit(per_page + 1).all()
+            has_more = len(rows) > per_page
+            rows = rows[:per_page]
+            
+            return jsonify({
+                'contacts': [row._asdict() for row in rows],
+                'pagination': {
+                    'per_page': per_page,
+                    'has_more': has_more,
+                    'next_cursor': str(rows[-1].id) if has_more else None
+                }
+            }), 200
+        
+        # Paginate (in id order, so pages are stable)
+        total = count_rows(query, Contact.id)
+        rows = query.order_by(Contact.id).limit(per_page).offset((page - 1) * per_page).all()
         
-        contacts = [contact.to_dict() for contact in paginated.items]
+        contacts = [row._asdict() for row in rows]
         
         return jsonify({
             'contacts': contacts,
             'pagination': {
                 'page': page,
                 'per_page': per_page,
-                'total': paginated.total,
-                'pages': paginated.pages
+                'total': total,
+                'pages': page_count(total, per_page)
             }
         }), 200
         
+    except APIError as e:
+        return jsonify(e.to_dict()), e.status_code
     except Exception as e:
-        error = APIError(str(e), 500)
-        return jsonify(error.to_dict()), 500
+        return server_error_response(e)
 
 
 @contacts_bp.route('', methods=['POST'])
@@ -103,17 +169,14 @@ def create_contact():
         
         company_id = data.get('company_id')
         
-        # Verify company exists and belongs to user
-        company = Company.query.filter_by(id=company_id, user_id=user_id).first()
-        if not company:
+        # Verify company exists and belongs to user (fetching only its id)
+        if db.session.query(Company.id).filter_by(id=company_id, user_id=user_id).scalar() is None:
             raise APIError('Company not found', 404)
         
         # Check for duplicate email in same company
         email = data.get('email', '').strip() or None
-        if email:
-            existing = Contact.query.filter_by(company_id=company_id, email=email).first()
-            if existing:
-                raise APIError('Contact with this email already exists for this company', 400)
+        if email and _email_taken(company_id, email):
+            raise APIError('Contact with this email already exists for this company', 400)
         
         # Create contact
         contact = Contact(
@@ -128,6 +191,7 @@ def create_contact():
         
         db.session.add(contact)
         db.session.commit()
+        invalidate_lists(user_id, 'contacts', 'companies')
         
         return jsonify({
             'message': 'Contact created successfully',
@@ -139,8 +203,7 @@ def create_contact():
         return jsonify(e.to_dict()), e.status_code
     except Exception as e:
         db.session.rollback()
-        error = APIError(str(e), 500)
-        return jsonify(error.to_dict()), 500
+        return server_error_response(e)
 
 
 @contacts_bp.route('/discover', methods=['POST'])
@@ -149,6 +212,10 @@ def discover_contacts():
     """
     Discover contacts via Hunter.io API.
     
+    The Hunter.io lookup runs in the background so the request doesn't hold a
+    worker for up to the API timeout. The user gets a notification when the
+    discovered contacts have been added (or the lookup failed).
+    
     Request body:
     {
         "company_id": 1,
@@ -156,7 +223,7 @@ def discover_contacts():
     }
     
     Returns:
-        JSON with discovered contacts or fallback message
+        JSON confirming the discovery was queued (202)
     """
     try:
         user_id = request.user_id
@@ -168,9 +235,9 @@ def discover_contacts():
         company_id = data.get('company_id')
         domain = data.get('company_domain', '').strip()
         
-        # Verify company exists and belongs to user
-        company = Company.query.filter_by(id=company_id, user_id=user_id).first()
-        if not company:
+        # Verify company exists and belongs to user (only its name is needed here)
+        company_name = db.session.query(Company.name).filter_by(id=company_id, user_id=user_id).scalar()
+        if company_name is None:
             raise APIError('Company not found', 404)
         
         # Try Hunter.io API
@@ -178,69 +245,150 @@ def discover_contacts():
         if not api_key or api_key == 'placeholder_hunter_api_key':
             raise APIError('Hunter.io API key not configured. Please add contacts manually.', 503)
         
-        try:
-            # Call Hunter.io API
-            response = requests.get(
-                'https://api.hunter.io/v2/domain-search',
-                params={
-                    'domain': domain,
-                    'limit': 10,
-                    'api_key': api_key
-                },
-                timeout=10
-            )
-            
-            if response.status_code == 401:
-                raise APIError('Hunter.io API key is invalid', 503)
-            elif response.status_code == 429:
-                raise APIError('Hunter.io API quota exceeded. Please add contacts manually.', 429)
-            elif response.status_code != 200:
-                raise APIError('Hunter.io API error. Please add contacts manually.', 503)
-            
-            data = response.json()
-            discovered_contacts = []
-            
-            # Process discovered contacts
-            for person in data.get('data', {}).get('emails', []):
-                email = person.get('value')
-                
-                # Check if contact already exists
-                existing = Contact.query.filter_by(company_id=company_id, email=email).first()
-                if existing:
-                    continue
-                
-                # Create contact
-                contact = Contact(
-                    user_id=user_id,
-                    company_id=company_id,
-                    name=f"{person.get('first_name', '')} {person.get('last_name', '')}".strip(),
-                    email=email,
-                    role=person.get('position'),
-                    source='API'
-                )
-                
-                db.session.add(contact)
-                discovered_contacts.append(contact.to_dict())
-            
-            db.session.commit()
-            
-            return jsonify({
-                'message': f'Discovered {len(discovered_contacts)} contacts',
-                'contacts': discovered_contacts
-            }), 201
-            
-        except requests.exceptions.Timeout:
-            raise APIError('Hunter.io API request timed out. Please try again later.', 408)
-        except requests.exceptions.RequestException as e:
-            raise APIError(f'Hunter.io API error: {str(e)}', 503)
+        _discovery_pool.submit(
+            _run_discovery,
+            current_app._get_current_object(),
+            user_id,
+            company_id,
+            company_name,
+            domain
+        )
+        
+        return jsonify({
+            'message': 'Contact discovery started. You will be notified when it completes.',
+            'status': 'queued'
+        }), 202
         
     except APIError as e:
-        db.session.rollback()
         return jsonify(e.to_dict()), e.status_code
     except Exception as e:
-        db.session.rollback()
-        error = APIError(str(e), 500)
-        return jsonify(error.to_dict()), 500
+        return server_error_response(e)
+
+
+def _fetch_hunter_emails(domain):
+    """
+    Look up people at a domain with the Hunter.io domain search API.
+    
+    Args:
+        domain (str): Company domain to search
+        
+    Raises:
+        APIError: If the API call fails
+        
+    Returns:
+        list: Email entries from the Hunter.io response
+    """
+    try:
+        response = _hunter_session.get(
+            'https://api.hunter.io/v2/domain-search',
+            params={
+                'domain': domain,
+                'limit': 10,
+                'api_key': config.HUNTER_API_KEY
+            },
+            timeout=10
+        )
+    except requests.exceptions.Timeout:
+        raise APIError('Hunter.io API request timed out. Please try again later.', 408)
+    except requests.exceptions.RequestException as e:
+        raise APIError(f'Hunter.io API error: {str(e)}', 503)
+    
+    if response.status_code == 401:
+        raise APIError('Hunter.io API key is invalid', 503)
+    elif response.status_code == 429:
+        raise APIError('Hunter.io API quota exceeded. Please add contacts manually.', 429)
+    elif response.status_code != 200:
+        raise APIError('Hunter.io API error. Please add contacts manually.', 503)
+    
+    # orjson parses the raw bytes directly (no charset detection or str decode, as
+    # response.json() does); the payload is a few KB, so streaming wouldn't pay off
+    try:
+        payload = orjson.loads(response.content)
+    except orjson.JSONDecodeError:
+        raise APIError('Hunter.io API error. Please add contacts manually.', 503)
+    
+    return (payload.get('data') or {}).get('emails') or []
+
+
+def _save_discovered_contacts(user_id, company_id, people):
+    """
+    Insert contacts for discovered emails the company doesn't have yet.
+    
+    Args:
+        user_id (int): ID of the user
+        company_id (int): ID of the company the contacts belong to
+        people (list): Email entries from the Hunter.io response
+        
+    Returns:
+        int: Number of contacts added
+    """
+    # Build rows for each email once (Hunter.io can repeat an email)
+    contact_rows = {}
+    for person in people:
+        email = person.get('value')
+        if not email or email in contact_rows:
+            continue
+        
+        contact_rows[email] = {
+            'user_id': user_id,
+            'company_id': company_id,
+            'name': f"{person.get('first_name') or ''} {person.get('last_name') or ''}".strip(),
+            'email': email,
+            'role': person.get('position'),
+            'source': 'API'
+        }
+    
+    # Emails the company already has are skipped by the unique (company_id, email)
+    # constraint, so deduplication and the bulk insert are a single statement
+    return insert_ignore_many(Contact, ['company_id', 'email'], list(contact_rows.values()))
+
+
+def _run_discovery(app, user_id, company_id, company_name, domain):
+    """
+    Background job: discover contacts for a company and notify the user.
+    
+    Args:
+        app: Flask application, for an app context in the worker thread
+        user_id (int): ID of the user
+        company_id (int): ID of the company
+        company_name (str): Company name for the notification message
+        domain (str): Company domain to search
+    """
+    with app.app_context():
+        try:
+            people = _fetch_hunter_emails(domain)
+            added = _save_discovered_contacts(user_id, company_id, people)
+            notification = Notification(
+                user_id=user_id,
+                type='contacts_discovered',
+                title='Contact discovery complete',
+                message=f'Discovered {added} new contacts at {company_name}',
+                related_type='company',
+                related_id=company_id
+            )
+        except Exception as e:
+            db.session.rollback()
+            if isinstance(e, APIError):
+                message = e.message
+            else:
+                app.logger.exception('Contact discovery for company %s failed', company_id)
+                message = 'Contact discovery failed. Please add contacts manually.'
+            notification = Notification(
+                user_id=user_id,
+                type='contacts_discovered',
+                title='Contact discovery failed',
+                message=message,
+                related_type='company',
+                related_id=company_id
+            )
+        
+        try:
+            db.session.add(notification)
+            db.session.commit()
+            invalidate_lists(user_id, 'contacts', 'companies', 'notifications')
+        except Exception:
+            db.session.rollback()
+            app.logger.exception('Could not save contact discovery result for company %s', company_id)
 
 
 @contacts_bp.route('/<int:id>', methods=['PUT'])
@@ -264,21 +412,25 @@ def update_contact(id):
         user_id = request.user_id
         data = request.get_json()
         
-        contact = Contact.query.filter_by(id=id, user_id=user_id).first()
-        if not contact:
+        contact = db.session.get(Contact, id)
+        if not contact or contact.user_id != user_id:
             raise APIError('Contact not found', 404)
         
         # Update fields
         if 'name' in data:
             contact.name = data.get('name', '').strip()
         if 'email' in data:
-            contact.email = data.get('email', '').strip() or None
+            email = data.get('email', '').strip() or None
+            if email and email != contact.email and _email_taken(contact.company_id, email):
+                raise APIError('Contact with this email already exists for this company', 400)
+            contact.email = email
         if 'linkedin_url' in data:
             contact.linkedin_url = data.get('linkedin_url', '').strip() or None
         if 'role' in data:
             contact.role = data.get('role', '').strip() or None
         
         db.session.commit()
+        invalidate_lists(user_id, 'contacts')
         
         return jsonify({
             'message': 'Contact updated successfully',
@@ -290,8 +442,7 @@ def update_contact(id):
         return jsonify(e.to_dict()), e.status_code
     except Exception as e:
         db.session.rollback()
-        error = APIError(str(e), 500)
-        return jsonify(error.to_dict()), 500
+        return server_error_response(e)
 
 
 @contacts_bp.route('/<int:id>', methods=['DELETE'])
@@ -306,12 +457,13 @@ def delete_contact(id):
     try:
         user_id = request.user_id
         
-        contact = Contact.query.filter_by(id=id, user_id=user_id).first()
-        if not contact:
+        contact = db.session.get(Contact, id)
+        if not contact or contact.user_id != user_id:
             raise APIError('Contact not found', 404)
         
         db.session.delete(contact)
         db.session.commit()
+        invalidate_lists(user_id, 'contacts', 'companies')
         
         return jsonify({
             'message': 'Contact deleted successfully'
@@ -322,5 +474,4 @@ def delete_contact(id):
         return jsonify(e.to_dict()), e.status_code
     except Exception as e:
         db.session.rollback()
-        error = APIError(str(e), 500)
-        return jsonify(error.to_dict()), 500
+        return server_error_response(e)
@@ -5,18 +5,70 @@ This module handles weekly goal management and gamification features
 including streaks and points.
 """
 
-from flask import Blueprint, request, jsonify
-from datetime import datetime, timedelta, date
+import json
+import os
+import orjson
+from flask import Blueprint, Response, request, jsonify
 from models import db
 from models.goal import Goal
 from models.streak import Streak
 from models.notification import Notification
-from utils.error_handlers import APIError
+from utils.error_handlers import APIError, server_error_response
+from utils.cache import invalidate_lists
 from utils.decorators import login_required
+from utils.request_time import request_week_start
 
 # Create Blueprint for goals routes
 goals_bp = Blueprint('goals', __name__, url_prefix='/api/v1/goals')
 
+# Micro-quests are static, so they are loaded (from data/micro_quests.json when present)
+# and serialized once at import instead of on every request
+_QUESTS_FILE = os.path.join(os.path.dirname(__file__), '..', 'data', 'micro_quests.json')
+_DEFAULT_QUESTS = [
+    {
+        'id': 1,
+        'title': 'First Application',
+        'description': 'Submit your first job application',
+        'reward_points': 10
+    },
+    {
+        'id': 2,
+        'title': 'Networking Pro',
+        'description': 'Reach out to 3 contacts',
+        'reward_points': 25
+    },
+    {
+        'id': 3,
+        'title': 'CV Optimizer',
+        'description': 'Analyze your CV against a job description',
+        'reward_points': 15
+    },
+    {
+        'id': 4,
+        'title': 'Week Warrior',
+        'description': 'Complete your weekly goals',
+        'reward_points': 50
+    }
+]
+
+
+def _load_micro_quests():
+    """
+    Load the micro-quest definitions.
+    
+    Returns:
+        list: Quests from data/micro_quests.json, or the built-in defaults
+    """
+    if os.path.exists(_QUESTS_FILE):
+        with open(_QUESTS_FILE, 'r') as f:
+            return json.load(f)
+    return _DEFAULT_QUESTS
+
+
+MICRO_QUESTS = _load_micro_quests()
+_QUEST_POINTS = {quest['id']: quest.get('reward_points', 10) for quest in MICRO_QUESTS}
+_QUESTS_RESPONSE = orjson.dumps({'quests': MICRO_QUESTS})
+
 
 @goals_bp.route('/current', methods=['GET'])
 @login_required
@@ -31,24 +83,20 @@ def get_current_goal():
         user_id = request.user_id
         
         # Get current week's Monday
-        today = datetime.utcnow().date()
-        week_start = today - timedelta(days=today.weekday())
-        
-        goal = Goal.query.filter_by(user_id=user_id, week_start=week_start).first()
+        week_start = request_week_start()
         
-        if not goal:
-            # Create goal if it doesn't exist
-            goal = Goal(user_id=user_id, week_start=week_start)
-            db.session.add(goal)
+        # Create goal if it doesn't exist
+        goal, created = Goal.get_or_create(user_id, week_start)
+        goal_data = goal.to_dict()
+        if created:
             db.session.commit()
         
         return jsonify({
-            'goal': goal.to_dict()
+            'goal': goal_data
         }), 200
         
     except Exception as e:
-        error = APIError(str(e), 500)
-        return jsonify(error.to_dict()), 500
+        return server_error_response(e)
 
 
 @goals_bp.route('', methods=['POST'])
@@ -74,14 +122,9 @@ def set_goal():
             raise APIError('Request body is required', 400)
         
         # Get current week's Monday
-        today = datetime.utcnow().date()
-        week_start = today - timedelta(days=today.weekday())
-        
-        goal = Goal.query.filter_by(user_id=user_id, week_start=week_start).first()
+        week_start = request_week_start()
         
-        if not goal:
-            goal = Goal(user_id=user_id, week_start=week_start)
-            db.session.add(goal)
+        goal, _ = Goal.get_or_create(user_id, week_start)
         
         # Update goals
         if 'applications_goal' in data:
@@ -102,8 +145,7 @@ def set_goal():
         return jsonify(e.to_dict()), e.status_code
     except Exception as e:
         db.session.rollback()
-        error = APIError(str(e), 500)
-        return jsonify(error.to_dict()), 500
+        return server_error_response(e)
 
 
 @goals_bp.route('/streak', methods=['GET'])
@@ -118,21 +160,18 @@ def get_streak():
     try:
         user_id = request.user_id
         
-        streak = Streak.query.filter_by(user_id=user_id).first()
-        
-        if not streak:
-            # Create streak if it doesn't exist
-            streak = Streak(user_id=user_id)
-            db.session.add(streak)
+        # Create streak if it doesn't exist
+        streak, created = Streak.get_or_create(user_id)
+        streak_data = streak.to_dict()
+        if created:
             db.session.commit()
         
         return jsonify({
-            'streak': streak.to_dict()
+            'streak': streak_data
         }), 200
         
     except Exception as e:
-        error = APIError(str(e), 500)
-        return jsonify(error.to_dict()), 500
+        return server_error_response(e)
 
 
 @goals_bp.route('/micro-quests', methods=['GET'])
@@ -145,50 +184,11 @@ def get_micro_quests():
         JSON with list of micro-quests
     """
     try:
-        # Load micro-quests from JSON file
-        import json
-        import os
-        
-        quests_file = os.path.join(os.path.dirname(__file__), '..', 'data', 'micro_quests.json')
-        
-        if os.path.exists(quests_file):
-            with open(quests_file, 'r') as f:
-                quests = json.load(f)
-        else:
-            quests = [
-                {
-                    'id': 1,
-                    'title': 'First Application',
-                    'description': 'Submit your first job application',
-                    'reward_points': 10
-                },
-                {
-                    'id': 2,
-                    'title': 'Networking Pro',
-                    'description': 'Reach out to 3 contacts',
-                    'reward_points': 25
-                },
-                {
-                    'id': 3,
-                    'title': 'CV Optimizer',
-                    'description': 'Analyze your CV against a job description',
-                    'reward_points': 15
-                },
-                {
-                    'id': 4,
-                    'title': 'Week Warrior',
-                    'description': 'Complete your weekly goals',
-                    'reward_points': 50
-                }
-            ]
-        
-        return jsonify({
-            'quests': quests
-        }), 200
+        # Serialized once at import; the quest list never changes while the process runs
+        return Response(_QUESTS_RESPONSE, status=200, mimetype='application/json')
         
     except Exception as e:
-        error = APIError(str(e), 500)
-        return jsonify(error.to_dict()), 500
+        return server_error_response(e)
 
 
 @goals_bp.route('/micro-quests/<int:quest_id>/complete', methods=['POST'])
@@ -203,22 +203,9 @@ def complete_micro_quest(quest_id):
     try:
         user_id = request.user_id
         
-        streak = Streak.query.filter_by(user_id=user_id).first()
-        
-        if not streak:
-            streak = Streak(user_id=user_id)
-            db.session.add(streak)
-        
         # Award points based on quest
-        quest_points = {
-            1: 10,
-            2: 25,
-            3: 15,
-            4: 50
-        }
-        
-        points = quest_points.get(quest_id, 10)
-        streak.total_points += points
+        points = _QUEST_POINTS.get(quest_id, 10)
+        streak = Streak.add_points(user_id, points)
         
         # Create notification
         notification = Notification(
@@ -230,15 +217,17 @@ def complete_micro_quest(quest_id):
         )
         db.session.add(notification)
         
+        # Serialize before commit so the streak isn't re-selected afterwards
+        streak_data = streak.to_dict()
         db.session.commit()
+        invalidate_lists(user_id, 'notifications')
         
         return jsonify({
             'message': 'Quest completed!',
             'points_earned': points,
-            'streak': streak.to_dict()
+            'streak': streak_data
         }), 200
         
     except Exception as e:
         db.session.rollback()
-        error = APIError(str(e), 500)
-        return jsonify(error.to_dict()), 500
+        return server_error_response(e)
@@ -7,8 +7,10 @@ This module handles in-app notification management.
 from flask import Blueprint, request, jsonify
 from models import db
 from models.notification import Notification
-from utils.error_handlers import APIError
+from utils.error_handlers import APIError, server_error_response
+from utils.cache import cached_list, invalidate_lists
 from utils.decorators import login_required
+from utils.pagination import normalize_page_args, count_rows, page_count, before_cursor, require_cursor_row
 
 # Create Blueprint for notifications routes
 notifications_bp = Blueprint('notifications', __name__, url_prefix='/api/v1/notifications')
@@ -16,6 +18,7 @@ notifications_bp = Blueprint('notifications', __name__, url_prefix='/api/v1/noti
 
 @notifications_bp.route('', methods=['GET'])
 @login_required
+@cached_list('notifications')
 def list_notifications():
     """
     Get all notifications for the current user.
@@ -25,6 +28,8 @@ def list_notifications():
     - type: Filter by notification type
     - page: Page number (default: 1)
     - per_page: Items per page (default: 10)
+    - mode: 'cursor' for infinite scroll (no total count; pass back next_cursor as cursor)
+    - cursor: Cursor returned by the previous page in cursor mode
     
     Returns:
         JSON with list of notifications and unread count
@@ -35,44 +40,81 @@ def list_notifications():
         # Get query parameters
         is_read = request.args.get('is_read')
         notification_type = request.args.get('type', '').strip()
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
+        mode = request.args.get('mode', '').strip()
+        page, per_page = normalize_page_args(
+            request.args.get('page', 1, type=int),
+            request.args.get('per_page', 10, type=int)
+        )
         
-        # Build query
-        query = Notification.query.filter_by(user_id=user_id)
+        # Build query (read-only listing: select plain rows of the notification columns
+        # instead of hydrating Notification objects; the row keys match Notification.to_dict())
+        query = Notification.query.with_entities(*Notification.__table__.columns).filter(
+            Notification.user_id == user_id
+        )
         
         if is_read is not None:
             is_read_bool = is_read.lower() == 'true'
-            query = query.filter_by(is_read=is_read_bool)
+            query = query.filter(Notification.is_read == is_read_bool)
         
         if notification_type:
-            query = query.filter_by(type=notification_type)
-        
-        # Order by created_at descending
-        query = query.order_by(Notification.created_at.desc())
+            query = query.filter(Notification.type == notification_type)
+        
+        # Order by created_at descending (id breaks ties between rows created together)
+        ordering = (Notification.created_at.desc(), Notification.id.desc())
+        
+        def unread_count():
+            return count_rows(Notification.query.filter_by(user_id=user_id, is_read=False), Notification.id)
+        
+        # Cursor mode: seek past the previous page instead of OFFSET, and skip the count
+        if mode == 'cursor':
+            cursor = request.args.get('cursor')
+            if cursor:
+                query = query.filter(before_cursor(Notification.created_at, Notification.id, cursor))
+            
+            items = query.order_by(*ordering).limit(per_page + 1).all()
+            has_more = len(items) > per_page
+            items = items[:per_page]
+            if cursor and not items:
+                # Empty page: make sure it's the end of the list, not a deleted cursor row
+                require_cursor_row(Notification.id, cursor, user_id)
+            
+            return jsonify({
+                'notifications': [row._asdict() for row in items],
+                'unread_count': unread_count(),
+                'pagination': {
+                    'per_page': per_page,
+                    'has_more': has_more,
+                    'next_cursor': str(items[-1].id) if has_more else None
+                }
+            }), 200
         
         # Paginate
-        paginated = query.paginate(page=page, per_page=per_page, error_out=False)
+        total = count_rows(query, Notification.id)
+        items = query.order_by(*ordering).limit(per_page).offset((page - 1) * per_page).all()
         
-        notifications = [notif.to_dict() for notif in paginated.items]
+        notifications = [row._asdict() for row in items]
         
-        # Get unread count
-        unread_count = Notification.query.filter_by(user_id=user_id, is_read=False).count()
+        # When listing exactly the unread notifications, the total already is the unread count
+        if is_read is not None and not is_read_bool and not notification_type:
+            unread = total
+        else:
+            unread = unread_count()
         
         return jsonify({
             'notifications': notifications,
-            'unread_count': unread_count,
+            'unread_count': unread,
             'pagination': {
                 'page': page,
                 'per_page': per_page,
-                'total': paginated.total,
-                'pages': paginated.pages
+                'total': total,
+                'pages': page_count(total, per_page)
             }
         }), 200
         
+    except APIError as e:
+        return jsonify(e.to_dict()), e.status_code
     except Exception as e:
-        error = APIError(str(e), 500)
-        return jsonify(error.to_dict()), 500
+        return server_error_response(e)
 
 
 @notifications_bp.route('/<int:id>/read', methods=['PUT'])
@@ -87,12 +129,13 @@ def mark_as_read(id):
     try:
         user_id = request.user_id
         
-        notification = Notification.query.filter_by(id=id, user_id=user_id).first()
-        if not notification:
+        notification = db.session.get(Notification, id)
+        if not notification or notification.user_id != user_id:
             raise APIError('Notification not found', 404)
         
         notification.is_read = True
         db.session.commit()
+        invalidate_lists(user_id, 'notifications')
         
         return jsonify({
             'message': 'Notification marked as read',
@@ -104,8 +147,7 @@ def mark_as_read(id):
         return jsonify(e.to_dict()), e.status_code
     except Exception as e:
         db.session.rollback()
-        error = APIError(str(e), 500)
-        return jsonify(error.to_dict()), 500
+        return server_error_response(e)
 
 
 @notifications_bp.route('/read-all', methods=['PUT'])
@@ -120,21 +162,25 @@ def mark_all_as_read():
     try:
         user_id = request.user_id
         
-        # Update all unread notifications
-        Notification.query.filter_by(user_id=user_id, is_read=False).update(
+        # Update all unread notifications; the UPDATE reports how many rows it changed,
+        # and afterwards nothing is unread, so clients needn't re-fetch the count
+        updated = Notification.query.filter_by(user_id=user_id, is_read=False).update(
             {'is_read': True},
             synchronize_session=False
         )
-        db.session.commit()
+        if updated:
+            db.session.commit()
+            invalidate_lists(user_id, 'notifications')
         
         return jsonify({
-            'message': 'All notifications marked as read'
+            'message': 'All notifications marked as read',
+            'updated': updated,
+            'unread_count': 0
         }), 200
         
     except Exception as e:
         db.session.rollback()
-        error = APIError(str(e), 500)
-        return jsonify(error.to_dict()), 500
+        return server_error_response(e)
 
 
 @notifications_bp.route('/<int:id>', methods=['DELETE'])
@@ -149,12 +195,13 @@ def delete_notification(id):
     try:
         user_id = request.user_id
         
-        notification = Notification.query.filter_by(id=id, user_id=user_id).first()
-        if not notification:
+        notification = db.session.get(Notification, id)
+        if not notification or notification.user_id != user_id:
             raise APIError('Notification not found', 404)
         
         db.session.delete(notification)
         db.session.commit()
+        invalidate_lists(user_id, 'notifications')
         
         return jsonify({
             'message': 'Notification deleted successfully'
@@ -165,5 +212,4 @@ def delete_notification(id):
         return jsonify(e.to_dict()), e.status_code
     except Exception as e:
         db.session.rollback()
-        error = APIError(str(e), 500)
-        return jsonify(error.to_dict()), 500
+        return server_error_response(e)
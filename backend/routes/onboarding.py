@@ -4,13 +4,12 @@ Onboarding routes for the JobBuddy API.
 This module handles the 7-step onboarding process for new users.
 """
 
-import json
 from flask import Blueprint, request, jsonify
-from datetime import datetime
 from models import db
 from models.onboarding import OnboardingData
-from utils.error_handlers import APIError
+from utils.error_handlers import APIError, server_error_response
 from utils.decorators import login_required
+from utils.request_time import request_now
 
 # Create Blueprint for onboarding routes
 onboarding_bp = Blueprint('onboarding', __name__, url_prefix='/api/v1/onboarding')
@@ -67,21 +66,21 @@ def create_onboarding():
         onboarding.dream_milestone = data.get('dream_milestone', '').strip()
         onboarding.availability = data.get('availability', '').strip()
         
-        # Store skills and locations as JSON
+        # Store skills and locations as JSON arrays
         skills = data.get('skills', [])
         if isinstance(skills, list):
-            onboarding.skills = json.dumps(skills)
+            onboarding.skills = skills
         else:
             raise APIError('Skills must be an array', 400)
         
         preferred_locations = data.get('preferred_locations', [])
         if isinstance(preferred_locations, list):
-            onboarding.preferred_locations = json.dumps(preferred_locations)
+            onboarding.preferred_locations = preferred_locations
         else:
             raise APIError('Preferred locations must be an array', 400)
         
         # Mark as completed
-        onboarding.completed_at = datetime.utcnow()
+        onboarding.completed_at = request_now()
         
         db.session.add(onboarding)
         db.session.commit()
@@ -96,8 +95,7 @@ def create_onboarding():
         return jsonify(e.to_dict()), e.status_code
     except Exception as e:
         db.session.rollback()
-        error = APIError(str(e), 500)
-        return jsonify(error.to_dict()), 500
+        return server_error_response(e)
 
 
 @onboarding_bp.route('', methods=['GET'])
@@ -124,5 +122,4 @@ def get_onboarding():
     except APIError as e:
         return jsonify(e.to_dict()), e.status_code
     except Exception as e:
-        error = APIError(str(e), 500)
-        return jsonify(error.to_dict()), 500
+        return server_error_response(e)
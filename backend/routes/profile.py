@@ -5,18 +5,20 @@ This module handles user profile management, settings, and account deletion.
 """
 
 from flask import Blueprint, request, jsonify
+from sqlalchemy import update
 from models import db
 from models.user import User
+from models.onboarding import OnboardingData
 from utils.validators import validate_password
 from utils.error_handlers import APIError
-from utils.decorators import login_required
+from utils.decorators import login_required, user_required, forget_user
 
 # Create Blueprint for profile routes
 profile_bp = Blueprint('profile', __name__, url_prefix='/api/v1/profile')
 
 
 @profile_bp.route('', methods=['GET'])
-@login_required
+@user_required
 def get_profile():
     """
     Get current user's profile.
@@ -24,16 +26,11 @@ def get_profile():
     Returns:
         JSON with user profile data and statistics
     """
-    try:
-        user = request.current_user
-        
-        return jsonify({
-            'user': user.to_dict(include_stats=True)
-        }), 200
-        
-    except Exception as e:
-        error = APIError(str(e), 500)
-        return jsonify(error.to_dict()), 500
+    user = request.current_user
+    
+    return jsonify({
+        'user': user.to_dict(include_stats=True)
+    }), 200
 
 
 @profile_bp.route('', methods=['PUT'])
@@ -51,38 +48,66 @@ def update_profile():
     Returns:
         JSON with updated user data
     """
-    try:
-        user = request.current_user
-        data = request.get_json()
-        
-        if not data:
-            raise APIError('Request body is required', 400)
-        
-        # Update name if provided
-        if 'name' in data:
-            name = data.get('name', '').strip()
-            if not name or len(name) < 2:
-                raise APIError('Name must be at least 2 characters long', 400)
-            user.name = name
-        
-        # Update dream milestone if provided
-        if 'dream_milestone' in data:
-            user.dream_milestone = data.get('dream_milestone', '').strip()
-        
+    user_id = request.user_id
+    data = request.get_json()
+    
+    if not data:
+        raise APIError('Request body is required', 400)
+    
+    # Update name if provided
+    changes = {}
+    if 'name' in data:
+        name = data.get('name', '').strip()
+        if not name or len(name) < 2:
+            raise APIError('Name must be at least 2 characters long', 400)
+        changes['name'] = name
+    
+    # Update dream milestone if provided (it is stored with the onboarding data).
+    # Each UPDATE only matches when the value actually differs, so re-saving an
+    # unchanged form writes nothing.
+    modified = False
+    if 'dream_milestone' in data:
+        dream_milestone = data.get('dream_milestone', '').strip()
+        result = db.session.execute(
+            update(OnboardingData)
+            .where(
+                OnboardingData.user_id == user_id,
+                OnboardingData.dream_milestone.is_distinct_from(dream_milestone)
+            )
+            .values(dream_milestone=dream_milestone)
+        )
+        modified = result.rowcount > 0
+        # No match is either an unchanged value or a user without onboarding data
+        if not modified and not db.session.query(
+            OnboardingData.query.filter_by(user_id=user_id).exists()
+        ).scalar():
+            raise APIError('Onboarding data not found', 404)
+    
+    # One UPDATE of just the changed columns, returning the row for the response
+    user = None
+    if changes:
+        user = db.session.scalars(
+            update(User)
+            .where(User.id == user_id, User.name != changes['name'])
+            .values(**changes)
+            .returning(User)
+        ).one_or_none()
+    if user:
+        modified = True
+    else:
+        # Nothing to change on the user row: read it for the response
+        user = db.session.get(User, user_id)
+        if not user:
+            raise APIError('User not found', 404)
+    
+    user_data = user.to_dict()
+    if modified:
         db.session.commit()
-        
-        return jsonify({
-            'message': 'Profile updated successfully',
-            'user': user.to_dict()
-        }), 200
-        
-    except APIError as e:
-        db.session.rollback()
-        return jsonify(e.to_dict()), e.status_code
-    except Exception as e:
-        db.session.rollback()
-        error = APIError(str(e), 500)
-        return jsonify(error.to_dict()), 500
+    
+    return jsonify({
+        'message': 'Profile updated successfully',
+        'user': user_data
+    }), 200
 
 
 @profile_bp.route('/password', methods=['PUT'])
@@ -100,42 +125,38 @@ def change_password():
     Returns:
         JSON success message
     """
-    try:
-        user = request.current_user
-        data = request.get_json()
-        
-        if not data or not all(k in data for k in ['current_password', 'new_password']):
-            raise APIError('Missing required fields: current_password, new_password', 400)
-        
-        current_password = data.get('current_password', '')
-        new_password = data.get('new_password', '')
-        
-        # Verify current password
-        if not user.check_password(current_password):
-            raise APIError('Current password is incorrect', 401, 'INVALID_PASSWORD')
-        
-        # Validate new password
-        validate_password(new_password)
-        
-        # Check that new password is different from current
-        if current_password == new_password:
-            raise APIError('New password must be different from current password', 400)
-        
-        # Update password
-        user.set_password(new_password)
-        db.session.commit()
-        
-        return jsonify({
-            'message': 'Password changed successfully'
-        }), 200
-        
-    except APIError as e:
-        db.session.rollback()
-        return jsonify(e.to_dict()), e.status_code
-    except Exception as e:
-        db.session.rollback()
-        error = APIError(str(e), 500)
-        return jsonify(error.to_dict()), 500
+    user_id = request.user_id
+    data = request.get_json()
+    
+    if not data or not all(k in data for k in ['current_password', 'new_password']):
+        raise APIError('Missing required fields: current_password, new_password', 400)
+    
+    current_password = data.get('current_password', '')
+    new_password = data.get('new_password', '')
+    
+    # Verify current password (fetching only the hash column)
+    if not User.verify_password_by_id(user_id, current_password):
+        raise APIError('Current password is incorrect', 401, 'INVALID_PASSWORD')
+    
+    # Validate new password
+    validate_password(new_password)
+    
+    # Check that new password is different from current
+    if current_password == new_password:
+        raise APIError('New password must be different from current password', 400)
+    
+    # Update password with a single UPDATE of the hash column
+    db.session.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(password_hash=User.hash_password(new_password))
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    
+    return jsonify({
+        'message': 'Password changed successfully'
+    }), 200
 
 
 @profile_bp.route('', methods=['DELETE'])
@@ -147,18 +168,16 @@ def delete_account():
     Returns:
         JSON success message
     """
-    try:
-        user = request.current_user
-        
-        # Delete user (cascade will delete all related data)
-        db.session.delete(user)
-        db.session.commit()
-        
-        return jsonify({
-            'message': 'Account deleted successfully'
-        }), 200
-        
-    except Exception as e:
-        db.session.rollback()
-        error = APIError(str(e), 500)
-        return jsonify(error.to_dict()), 500
+    # Loaded without raiseload: the ORM delete cascade walks the user's relationships
+    user = db.session.get(User, request.user_id)
+    if not user:
+        raise APIError('User not found', 404)
+    
+    # Delete user (cascade will delete all related data)
+    db.session.delete(user)
+    db.session.commit()
+    forget_user(request.user_id)
+    
+    return jsonify({
+        'message': 'Account deleted successfully'
+    }), 200
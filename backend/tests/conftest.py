@@ -0,0 +1,44 @@
+"""
+Shared pytest fixtures for the JobBuddy API tests.
+
+Tests run against an in-memory SQLite database created from the models.
+"""
+
+import os
+import sys
+
+# Configuration is read at import time, so set it before the app is imported
+os.environ['DATABASE_URL'] = 'sqlite://'
+os.environ['AUTO_CREATE_TABLES'] = '1'
+os.environ.pop('REDIS_URL', None)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from app import create_app
+from models import db
+
+
+@pytest.fixture
+def app():
+    """Create a fresh app and empty database for each test."""
+    app = create_app()
+    yield app
+    with app.app_context():
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """Test client for the app."""
+    return app.test_client()
+
+
+@pytest.fixture
+def auth_headers(client):
+    """Register a user and return Authorization headers for them."""
+    response = client.post('/api/v1/auth/register', json={
+        'email': 'test@example.com',
+        'password': 'Password123',
+        'name': 'Test User'
+    })
+    return {'Authorization': f"Bearer {response.get_json()['access_token']}"}
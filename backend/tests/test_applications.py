@@ -0,0 +1,48 @@
+"""
+Tests for the application routes.
+"""
+
+from models import db
+from models.application import Application
+from models.goal import Goal
+from models.notification import Notification
+
+
+def test_update_status_to_applied_is_saved(app, client, auth_headers):
+    """Changing a Planned application to Applied persists the status, notification and goal count"""
+    company = client.post('/api/v1/companies', headers=auth_headers, json={'name': 'Acme'}).get_json()['company']
+    application = client.post('/api/v1/applications', headers=auth_headers, json={
+        'company_id': company['id'],
+        'job_title': 'Backend Engineer'
+    }).get_json()['application']
+    assert application['status'] == 'Planned'
+
+    response = client.put(f"/api/v1/applications/{application['id']}", headers=auth_headers, json={'status': 'Applied'})
+    assert response.status_code == 200
+    assert response.get_json()['application']['status'] == 'Applied'
+
+    with app.app_context():
+        saved = db.session.get(Application, application['id'])
+        assert saved.status == 'Applied'
+        assert saved.applied_date is not None
+        assert Notification.query.filter_by(
+            user_id=saved.user_id, type='follow_up', related_id=saved.id
+        ).count() == 1
+        assert Goal.query.filter_by(user_id=saved.user_id).one().applications_current == 1
+
+
+def test_update_without_changes_keeps_application(app, client, auth_headers):
+    """Re-sending unchanged values succeeds and leaves the row as it was"""
+    company = client.post('/api/v1/companies', headers=auth_headers, json={'name': 'Acme'}).get_json()['company']
+    application = client.post('/api/v1/applications', headers=auth_headers, json={
+        'company_id': company['id'],
+        'job_title': 'Backend Engineer',
+        'status': 'Applied'
+    }).get_json()['application']
+
+    response = client.put(f"/api/v1/applications/{application['id']}", headers=auth_headers, json={'status': 'Applied'})
+    assert response.status_code == 200
+
+    with app.app_context():
+        assert db.session.get(Application, application['id']).status == 'Applied'
+        assert Notification.query.filter_by(type='follow_up').count() == 1
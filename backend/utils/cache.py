@@ -0,0 +1,110 @@
+"""
+Response caching utilities for the JobBuddy API.
+
+This module caches per-user list responses in Redis. Each user has a version
+counter per list; cache keys include it, so a write invalidates every cached
+page of that list with a single INCR instead of deleting keys by pattern.
+
+Caching is optional: it is only active when REDIS_URL is configured and the
+redis package is installed. Redis errors fall back to running the view.
+"""
+
+import hashlib
+from functools import wraps
+from flask import request, current_app
+
+try:
+    import redis
+except ImportError:  # Optional dependency
+    redis = None
+
+
+def init_cache(app):
+    """
+    Create the app's Redis client from REDIS_URL, if caching is available.
+    
+    The client is stored in app.extensions and connects lazily on first command.
+    
+    Args:
+        app: Flask application instance
+    """
+    url = app.config.get('REDIS_URL')
+    app.extensions['list_cache'] = redis.Redis.from_url(url) if redis and url else None
+
+
+def _get_client():
+    """Get the current app's Redis client, or None when caching is off."""
+    return current_app.extensions.get('list_cache')
+
+
+def _version_key(namespace, user_id):
+    """Build the key holding a user's version counter for a list."""
+    return f'{namespace}_ver:{user_id}'
+
+
+def cached_list(namespace):
+    """
+    Decorator to cache a user's list response in Redis.
+
+    Must be applied below login_required so request.user_id is set. Only
+    200 responses are cached, keyed by user, list version and query string.
+
+    Args:
+        namespace (str): List name used in cache keys (e.g. 'apps')
+
+    Returns:
+        Decorator for a Flask route function
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            client = _get_client()
+            if client is None:
+                return f(*args, **kwargs)
+
+            user_id = request.user_id
+            try:
+                version = int(client.get(_version_key(namespace, user_id)) or 0)
+                query_hash = hashlib.md5(request.query_string).hexdigest()
+                key = f'{namespace}:{user_id}:{version}:{query_hash}'
+                cached = client.get(key)
+            except redis.RedisError:
+                return f(*args, **kwargs)
+
+            if cached is not None:
+                return current_app.response_class(cached, mimetype='application/json')
+
+            rv = f(*args, **kwargs)
+            response = current_app.make_response(rv)
+            if response.status_code == 200:
+                try:
+                    client.setex(key, current_app.config['LIST_CACHE_TTL'], response.get_data())
+                except redis.RedisError:
+                    pass
+            return response
+
+        return decorated_function
+    return decorator
+
+
+def invalidate_lists(user_id, *namespaces):
+    """
+    Invalidate a user's cached list responses after a write.
+
+    Call after the write has been committed.
+
+    Args:
+        user_id (int): ID of the user whose data changed
+        *namespaces (str): Lists affected by the write (e.g. 'apps', 'companies')
+    """
+    client = _get_client()
+    if client is None:
+        return
+
+    try:
+        pipe = client.pipeline(transaction=False)
+        for namespace in namespaces:
+            pipe.incr(_version_key(namespace, user_id))
+        pipe.execute()
+    except redis.RedisError:
+        current_app.logger.warning('Could not invalidate cached lists %s for user %s', namespaces, user_id)
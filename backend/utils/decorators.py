@@ -5,11 +5,68 @@ This module provides decorators for authentication, authorization, and other
 cross-cutting concerns.
 """
 
+import time
 from functools import wraps
 from flask import request
 from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+from sqlalchemy.orm import raiseload
 from .error_handlers import APIError
+from models import db
 from models.user import User
+from models.application import Application
+from models.company import Company
+from models.contact import Contact
+from models.outreach import OutreachActivity
+from models.cv_analysis import CVAnalysis
+
+# Models owner_required can check, by resource type
+_RESOURCE_MODELS = {
+    'application': Application,
+    'company': Company,
+    'contact': Contact,
+    'outreach': OutreachActivity,
+    'cv_analysis': CVAnalysis,
+}
+
+# Users recently confirmed to exist (user_id -> monotonic expiry), so most requests
+# skip the lookup query. Per process; deleted accounts are dropped with forget_user()
+# and any other worker stops accepting them within the TTL.
+_USER_CHECK_TTL = 30
+_USER_CHECK_MAX = 10000
+_verified_users = {}
+
+
+def _user_exists(user_id):
+    """
+    Check that a user exists, using the per-process cache when fresh.
+    
+    Args:
+        user_id (int): ID from the JWT
+        
+    Returns:
+        bool: True if the user exists
+    """
+    now = time.monotonic()
+    if _verified_users.get(user_id, 0) > now:
+        return True
+    
+    if db.session.query(User.id).filter_by(id=user_id).scalar() is None:
+        return False
+    
+    if len(_verified_users) >= _USER_CHECK_MAX:
+        _verified_users.clear()
+    _verified_users[user_id] = now + _USER_CHECK_TTL
+    return True
+
+
+def forget_user(user_id):
+    """
+    Drop a user from the existence cache. Call after deleting the account.
+    
+    Args:
+        user_id (int): ID of the deleted user
+    """
+    _verified_users.pop(user_id, None)
 
 
 def login_required(f):
@@ -17,7 +74,8 @@ def login_required(f):
     Decorator to require JWT authentication.
     
     This decorator verifies that a valid JWT token is present in the request
-    and that the user still exists in the database.
+    and that the user still exists in the database. The check runs once per
+    request; nested uses reuse the result.
     
     Args:
         f: Flask route function to decorate
@@ -27,6 +85,12 @@ def login_required(f):
     """
     @wraps(f)
     def decorated_function(*args, **kwargs):
+        # Already authenticated earlier in this request (nested login_required).
+        # Keyed on the request, not flask.g: g lives on the app context, which
+        # can outlast a single request.
+        if getattr(request, 'user_id', None) is not None:
+            return f(*args, **kwargs)
+        
         try:
             # Verify JWT token is present and valid
             verify_jwt_in_request()
@@ -34,14 +98,13 @@ def login_required(f):
             # Get user ID from token
             user_id = get_jwt_identity()
             
-            # Verify user still exists
-            user = User.query.get(user_id)
-            if not user:
+            # Verify user still exists (cached briefly, see _user_exists)
+            if not _user_exists(user_id):
                 raise APIError('User not found', 404)
             
             # Add user_id to request context for use in route
+            # (routes that need the User object use user_required)
             request.user_id = user_id
-            request.current_user = user
             
         except Exception as e:
             if isinstance(e, APIError):
@@ -53,7 +116,45 @@ def login_required(f):
     return decorated_function
 
 
-def owner_required(resource_type):
+def user_required(f):
+    """
+    Decorator to require JWT authentication and load the user.
+    
+    For routes that work on the User row itself. Instead of login_required's
+    id-only existence check, the user is loaded (without relationships: accessing
+    one raises instead of lazy loading) into request.current_user, and that load
+    doubles as the existence check.
+    
+    Args:
+        f: Flask route function to decorate
+        
+    Returns:
+        Decorated function that requires authentication
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        try:
+            # Verify JWT token is present and valid
+            verify_jwt_in_request()
+            user_id = get_jwt_identity()
+        except Exception:
+            raise APIError('Invalid or missing authentication token', 401)
+        
+        # Load the user, which also verifies they still exist
+        user = db.session.get(User, user_id, options=[raiseload('*')])
+        if not user:
+            raise APIError('User not found', 404)
+        
+        # Add user to request context for use in route
+        request.user_id = user_id
+        request.current_user = user
+        
+        return f(*args, **kwargs)
+    
+    return decorated_function
+
+
+def owner_required(resource_type, attach=True):
     """
     Decorator to verify user owns the resource.
     
@@ -62,10 +163,20 @@ def owner_required(resource_type):
     
     Args:
         resource_type (str): Type of resource ('application', 'company', etc.)
+        attach (bool): Whether to load the resource into request.<resource_type>.
+            With False, only the owner id is fetched for the check.
+        
+    Raises:
+        ValueError: If resource_type is unknown (at decoration time)
         
     Returns:
         Decorator function
     """
+    # Resolve the model once, when the route is decorated
+    model = _RESOURCE_MODELS.get(resource_type)
+    if model is None:
+        raise ValueError(f'Unknown resource type: {resource_type}')
+    
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
@@ -79,35 +190,24 @@ def owner_required(resource_type):
             if not user_id:
                 raise APIError('Authentication required', 401)
             
-            # Import model dynamically to avoid circular imports
-            if resource_type == 'application':
-                from models.application import Application
-                resource = Application.query.get(resource_id)
-            elif resource_type == 'company':
-                from models.company import Company
-                resource = Company.query.get(resource_id)
-            elif resource_type == 'contact':
-                from models.contact import Contact
-                resource = Contact.query.get(resource_id)
-            elif resource_type == 'outreach':
-                from models.outreach import OutreachActivity
-                resource = OutreachActivity.query.get(resource_id)
-            elif resource_type == 'cv_analysis':
-                from models.cv_analysis import CVAnalysis
-                resource = CVAnalysis.query.get(resource_id)
+            if attach:
+                resource = db.session.get(model, resource_id)
+                owner_id = resource.user_id if resource else None
             else:
-                raise APIError('Unknown resource type', 400)
+                # Only the owner id: no full row, no ORM object
+                owner_id = db.session.query(model.user_id).filter(model.id == resource_id).scalar()
             
             # Check if resource exists
-            if not resource:
+            if owner_id is None:
                 raise APIError(f'{resource_type.capitalize()} not found', 404)
             
             # Check if user owns the resource
-            if resource.user_id != user_id:
+            if owner_id != user_id:
                 raise APIError('You do not have permission to access this resource', 403)
             
             # Add resource to request context
-            setattr(request, resource_type, resource)
+            if attach:
+                setattr(request, resource_type, resource)
             
             return f(*args, **kwargs)
         
@@ -6,7 +6,8 @@ for consistent error handling across the application.
 """
 
 from flask import jsonify
-from werkzeug.exceptions import HTTPException
+from werkzeug.exceptions import HTTPException, default_exceptions
+from models import db
 
 
 class APIError(Exception):
@@ -18,26 +19,24 @@ class APIError(Exception):
         code (str): Error code for client handling
         status_code (int): HTTP status code
     """
+    # HTTP status code -> default error code for client handling
+    _DEFAULT_CODES = {
+        400: 'BAD_REQUEST',
+        401: 'UNAUTHORIZED',
+        403: 'FORBIDDEN',
+        404: 'NOT_FOUND',
+        408: 'TIMEOUT',
+        413: 'FILE_TOO_LARGE',
+        422: 'INVALID_DATA_FORMAT',
+        429: 'RATE_LIMIT_EXCEEDED',
+        500: 'INTERNAL_SERVER_ERROR',
+        503: 'SERVICE_UNAVAILABLE'
+    }
+
     def __init__(self, message, status_code=400, code=None):
         self.message = message
         self.status_code = status_code
-        self.code = code or self._get_default_code(status_code)
-
-    def _get_default_code(self, status_code):
-        """Map HTTP status code to error code."""
-        status_code_map = {
-            400: 'BAD_REQUEST',
-            401: 'UNAUTHORIZED',
-            403: 'FORBIDDEN',
-            404: 'NOT_FOUND',
-            408: 'TIMEOUT',
-            413: 'FILE_TOO_LARGE',
-            422: 'INVALID_DATA_FORMAT',
-            429: 'RATE_LIMIT_EXCEEDED',
-            500: 'INTERNAL_SERVER_ERROR',
-            503: 'SERVICE_UNAVAILABLE'
-        }
-        return status_code_map.get(status_code, 'UNKNOWN_ERROR')
+        self.code = code or self._DEFAULT_CODES.get(status_code, 'UNKNOWN_ERROR')
 
     def to_dict(self):
         """Convert error to dictionary for JSON response."""
@@ -49,17 +48,60 @@ class APIError(Exception):
         }
 
 
+def server_error_response(error):
+    """
+    Build the 500 response for an unexpected exception caught in a route.
+    
+    Produces the same body as APIError(str(error), 500).to_dict() without
+    constructing an exception object on the error path.
+    
+    Args:
+        error (Exception): The caught exception
+        
+    Returns:
+        tuple: (JSON response, 500)
+    """
+    return jsonify({
+        'error': {
+            'code': 'INTERNAL_SERVER_ERROR',
+            'message': str(error)
+        }
+    }), 500
+
+
 def register_error_handlers(app):
     """
     Register error handlers with the Flask app.
     
+    The APIError and generic handlers roll back the database session, so routes
+    can raise without their own try/except and rollback.
+    
+    Bodies for the generic 500 and for HTTP errors with their stock description
+    are serialized once here; the handlers only wrap them in a fresh response.
+    Call after app.json is set so the bodies use the app's JSON provider.
+    
     Args:
         app: Flask application instance
     """
+    def error_body(code, message):
+        return app.json.dumps({'error': {'code': code, 'message': message}}).encode()
+
+    def error_response(body, status_code):
+        return app.response_class(body, status=status_code, mimetype='application/json')
+
+    generic_body = error_body('INTERNAL_SERVER_ERROR', 'An unexpected error occurred')
+    # HTTP status code -> (stock description, serialized body)
+    http_bodies = {
+        status_code: (exc.description, error_body(
+            APIError._DEFAULT_CODES.get(status_code, 'UNKNOWN_ERROR'), exc.description
+        ))
+        for status_code, exc in default_exceptions.items()
+    }
 
     @app.errorhandler(APIError)
     def handle_api_error(error):
         """Handle custom API errors."""
+        db.session.rollback()
         response = jsonify(error.to_dict())
         response.status_code = error.status_code
         return response
@@ -67,15 +109,15 @@ def register_error_handlers(app):
     @app.errorhandler(HTTPException)
     def handle_http_error(error):
         """Handle HTTP exceptions."""
-        api_error = APIError(error.description, error.code)
-        response = jsonify(api_error.to_dict())
-        response.status_code = error.code
-        return response
+        cached = http_bodies.get(error.code)
+        if cached and cached[0] == error.description:
+            body = cached[1]
+        else:
+            body = error_body(APIError._DEFAULT_CODES.get(error.code, 'UNKNOWN_ERROR'), error.description)
+        return error_response(body, error.code)
 
     @app.errorhandler(Exception)
     def handle_generic_error(error):
         """Handle generic exceptions."""
-        api_error = APIError('An unexpected error occurred', 500)
-        response = jsonify(api_error.to_dict())
-        response.status_code = 500
-        return response
+        db.session.rollback()
+        return error_response(generic_body, 500)
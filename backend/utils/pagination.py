@@ -0,0 +1,132 @@
+"""
+Pagination helpers for the JobBuddy API.
+
+This module provides offset pagination with a lightweight COUNT query and
+keyset (cursor) pagination over (created_at, id) for newest-first listings.
+"""
+
+from sqlalchemy import select, func, and_, or_
+from sqlalchemy.orm import aliased
+from models import db
+from utils.error_handlers import APIError
+
+
+def normalize_page_args(page, per_page, default_per_page=10):
+    """
+    Clamp page arguments to usable values.
+
+    Args:
+        page (int): Requested page number (1-based)
+        per_page (int): Requested items per page
+        default_per_page (int): Fallback when per_page is missing or invalid
+
+    Returns:
+        tuple: (page, per_page)
+    """
+    if not page or page < 1:
+        page = 1
+    if not per_page or per_page < 1:
+        per_page = default_per_page
+    return page, per_page
+
+
+def count_rows(query, column):
+    """
+    Count the rows matched by a query's filters.
+
+    Issues SELECT count(column) directly against the filtered table instead of
+    wrapping the whole SELECT (with its ORDER BY) in a subquery.
+
+    Args:
+        query: Filtered query without loader options
+        column: Column to count, usually the primary key
+
+    Returns:
+        int: Number of matching rows
+    """
+    return query.order_by(None).with_entities(func.count(column)).scalar()
+
+
+def page_count(total, per_page):
+    """
+    Get the number of pages needed for a total.
+
+    Args:
+        total (int): Total number of rows
+        per_page (int): Items per page
+
+    Returns:
+        int: Number of pages
+    """
+    return -(-total // per_page)
+
+
+def decode_cursor(cursor):
+    """
+    Parse a cursor token (the id of the last row on the previous page).
+
+    Args:
+        cursor (str): Cursor token
+
+    Returns:
+        int: Row id
+
+    Raises:
+        APIError: If the cursor is malformed
+    """
+    try:
+        return int(cursor)
+    except (TypeError, ValueError):
+        raise APIError('Invalid cursor', 400)
+
+
+def before_cursor(created_column, id_column, cursor):
+    """
+    Build a filter selecting rows that come after the cursor in newest-first order.
+
+    The cursor row's created_at is read in a subquery so the comparison is made
+    between stored values (SQLite stores server-side timestamps as text).
+
+    Args:
+        created_column: The model's created_at attribute (e.g. Contact.created_at)
+        id_column: The model's primary key attribute (e.g. Contact.id)
+        cursor (str): Cursor token from the previous page
+
+    Returns:
+        SQL expression for use in query.filter()
+    """
+    row_id = decode_cursor(cursor)
+    cursor_row = aliased(id_column.class_)
+    cursor_created = (
+        select(getattr(cursor_row, created_column.key))
+        .where(getattr(cursor_row, id_column.key) == row_id)
+        .scalar_subquery()
+    )
+    return or_(
+        created_column < cursor_created,
+        and_(created_column == cursor_created, id_column < row_id)
+    )
+
+
+def require_cursor_row(id_column, cursor, user_id):
+    """
+    Check that the row a cursor points at still exists for the user.
+
+    before_cursor() compares against the cursor row, so a deleted row yields an
+    empty page that looks like the end of the list. Call this when a cursor page
+    comes back empty to tell the two apart.
+
+    Args:
+        id_column: The model's primary key attribute (e.g. Notification.id)
+        cursor (str): Cursor token from the previous page
+        user_id (int): Owner of the listing
+
+    Raises:
+        APIError: If the cursor row no longer exists
+    """
+    model = id_column.class_
+    row_exists = select(
+        select(id_column).where(id_column == decode_cursor(cursor), model.user_id == user_id).exists()
+    )
+    if not db.session.scalar(row_exists):
+        raise APIError('Cursor is no longer valid; restart from the first page', 400, 'INVALID_CURSOR')
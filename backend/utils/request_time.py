@@ -0,0 +1,50 @@
+"""
+Request clock utilities for the JobBuddy API.
+
+This module gives each request a single "now" so every date written while
+handling it agrees, computed on first use and cached on the request.
+(Not on flask.g: g lives on the app context, which can outlast a request.)
+"""
+
+from datetime import datetime, timedelta
+from flask import request
+
+
+def request_now():
+    """
+    Get the current UTC time for this request.
+
+    Returns:
+        datetime: Naive UTC datetime, the same for the whole request
+    """
+    now = getattr(request, 'request_now', None)
+    if now is None:
+        now = request.request_now = datetime.utcnow()
+    return now
+
+
+def request_today():
+    """
+    Get today's UTC date for this request.
+
+    Returns:
+        date: Current date
+    """
+    today = getattr(request, 'request_today', None)
+    if today is None:
+        today = request.request_today = request_now().date()
+    return today
+
+
+def request_week_start():
+    """
+    Get the Monday of the current week (the start of the goal week) for this request.
+
+    Returns:
+        date: Start of the current goal week
+    """
+    week_start = getattr(request, 'request_week_start', None)
+    if week_start is None:
+        today = request_today()
+        week_start = request.request_week_start = today - timedelta(days=today.weekday())
+    return week_start
@@ -0,0 +1,37 @@
+"""
+JSON serialization utilities for the JobBuddy API.
+
+This module provides an orjson-backed JSON provider so that responses are
+encoded by a C serializer instead of the standard library json module.
+"""
+
+import orjson
+from flask.json.provider import JSONProvider
+
+
+class ORJSONProvider(JSONProvider):
+    """
+    Flask JSON provider using orjson for encoding and decoding.
+
+    orjson serializes datetime, date and UUID values natively; anything else
+    it does not understand is converted with str().
+    """
+
+    def dumps(self, obj, **kwargs):
+        """Serialize data as a JSON string."""
+        return orjson.dumps(obj, default=str).decode()
+
+    def loads(self, s, **kwargs):
+        """Deserialize data from a JSON string or bytes."""
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """
+        Build a JSON response, passing orjson's bytes straight to the response
+        without the decode/encode round trip of dumps().
+        """
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=str),
+            mimetype='application/json'
+        )
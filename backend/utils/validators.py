@@ -4,10 +4,23 @@ Validation utilities for the JobBuddy API.
 This module provides validation functions for common input types and constraints.
 """
 
+import io
 import re
+from functools import lru_cache
 from .error_handlers import APIError
 
+# Patterns compiled once at import instead of looked up in re's cache on every call
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_URL_RE = re.compile(r'^https?://[^\s/$.?#].[^\s]*$')
+_UPPER_RE = re.compile(r'[A-Z]')
+_LOWER_RE = re.compile(r'[a-z]')
+_DIGIT_RE = re.compile(r'\d')
+# All three character classes in one scan; the per-class patterns above only run
+# on failure, to report which requirement is missing
+_STRONG_PASSWORD_RE = re.compile(r'(?s)(?=.*[A-Z])(?=.*[a-z])(?=.*\d)')
 
+
+@lru_cache(maxsize=4096)
 def validate_email(email):
     """
     Validate email format.
@@ -21,12 +34,17 @@ def validate_email(email):
     Returns:
         str: Valid email address
     """
-    email_regex = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    if not re.match(email_regex, email):
+    # Cheap structural reject before the regex: no '@', a space, or no dot in the
+    # domain can never match
+    if '@' not in email or ' ' in email or '.' not in email.rpartition('@')[2]:
+        raise APIError('Invalid email format', 400, 'INVALID_EMAIL')
+    
+    if not _EMAIL_RE.match(email):
         raise APIError('Invalid email format', 400, 'INVALID_EMAIL')
     return email
 
 
+# Not memoized: a cache would keep plaintext passwords in memory
 def validate_password(password):
     """
     Validate password strength.
@@ -49,18 +67,22 @@ def validate_password(password):
     if len(password) < 8:
         raise APIError('Password must be at least 8 characters long', 400, 'WEAK_PASSWORD')
     
-    if not re.search(r'[A-Z]', password):
+    if _STRONG_PASSWORD_RE.match(password):
+        return password
+    
+    if not _UPPER_RE.search(password):
         raise APIError('Password must contain at least one uppercase letter', 400, 'WEAK_PASSWORD')
     
-    if not re.search(r'[a-z]', password):
+    if not _LOWER_RE.search(password):
         raise APIError('Password must contain at least one lowercase letter', 400, 'WEAK_PASSWORD')
     
-    if not re.search(r'\d', password):
+    if not _DIGIT_RE.search(password):
         raise APIError('Password must contain at least one digit', 400, 'WEAK_PASSWORD')
     
     return password
 
 
+@lru_cache(maxsize=4096)
 def validate_job_title(job_title):
     """
     Validate job title.
@@ -96,8 +118,16 @@ def validate_url(url):
     Returns:
         str: Valid URL
     """
-    url_regex = r'^https?://[^\s/$.?#].[^\s]*$'
-    if not re.match(url_regex, url):
+    # Fast path for the usual well-formed URL: a known scheme, a valid first host
+    # character and no whitespace anywhere (isprintable() rejects every whitespace
+    # character except the space itself) always matches _URL_RE. Anything else is
+    # left to the regex.
+    if url.startswith(('https://', 'http://')):
+        rest = url[url.index('//') + 2:]
+        if len(rest) >= 2 and rest[0] not in '/$.?#' and ' ' not in url and url.isprintable():
+            return url
+    
+    if not _URL_RE.match(url):
         raise APIError('Invalid URL format', 400, 'INVALID_URL')
     
     return url
@@ -146,3 +176,52 @@ def validate_file_size(file_size, max_size_mb):
         raise APIError(f'File size exceeds maximum of {max_size_mb}MB', 413, 'FILE_TOO_LARGE')
     
     return file_size
+
+
+# Read size for streams that can't seek (64 KiB)
+_FILE_CHUNK_SIZE = 64 * 1024
+
+
+def validate_file_stream(file_storage, max_size_mb):
+    """
+    Validate the size of an uploaded file without reading it into memory.
+    
+    Seekable streams are measured with seek/tell. Other streams are read in
+    chunks, stopping as soon as the limit is exceeded. A file that passes
+    can still be read in full by the caller. Check the extension with
+    validate_file_type first, so a bad file type is rejected before any bytes
+    are read.
+    
+    Args:
+        file_storage (FileStorage): Uploaded file from request.files
+        max_size_mb (int): Maximum allowed size in MB
+        
+    Raises:
+        APIError: If file is too large
+        
+    Returns:
+        int: File size in bytes
+    """
+    max_size_bytes = max_size_mb * 1024 * 1024
+    stream = file_storage.stream
+    
+    if stream.seekable():
+        start = stream.tell()
+        file_size = stream.seek(0, 2) - start
+        stream.seek(start)
+    else:
+        # Can't rewind a non-seekable stream, so keep what was read and put it back
+        chunks = []
+        file_size = 0
+        while True:
+            chunk = stream.read(_FILE_CHUNK_SIZE)
+            if not chunk:
+                break
+            file_size += len(chunk)
+            if file_size > max_size_bytes:
+                break
+            chunks.append(chunk)
+        if file_size <= max_size_bytes:
+            file_storage.stream = io.BytesIO(b''.join(chunks))
+    
+    return validate_file_size(file_size, max_size_mb)